@@ -1,20 +1,95 @@
 from importlib import import_module
-from inspect import signature
 import os
+from pathlib import Path
+import sys
+import time
 
-import click
-import requests
+from aoc import metrics
 
 
-INPUT_URL = "https://adventofcode.com/2024/day/{day}/input"
+DEFAULT_INPUT_URL = "https://adventofcode.com/2024/day/{day}/input"
 
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "aoc"
+
+
+def get_input_url():
+    return os.environ.get("AOC_INPUT_URL", DEFAULT_INPUT_URL)
+
+
+def get_cache_dir():
+    return Path(os.environ.get("AOC_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def _write_atomic(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def get_input(day, cache_dir=None, offline=False, revalidate=False):
+    """Return the puzzle input for `day`, using the on-disk cache where possible.
+
+    Inputs are stored content-addressed under `<cache_dir>/objects/<sha256>`, with a small index
+    entry per day holding the digest and the validators (`ETag`/`Last-Modified`) sent by the server.
+    A cached input is returned without touching the network unless `revalidate` is set, in which
+    case a conditional request is made and the cached copy is kept on a 304. With `offline`, the
+    network is never used and a missing entry is an error.
+    """
+    from hashlib import sha256
+    import json
+
+    cache_dir = Path(cache_dir) if cache_dir else get_cache_dir()
+    index_path = cache_dir / "index" / f"day{day}.json"
+
+    entry = None
+    if index_path.exists():
+        entry = json.loads(index_path.read_text())
+        object_path = cache_dir / "objects" / entry["sha256"]
+        if not object_path.exists():
+            entry = None
+
+    if entry and (offline or not revalidate):
+        return object_path.read_text()
+
+    if offline:
+        raise FileNotFoundError(f"input for day {day} is not in the cache at {cache_dir}")
+
+    # imported here since it's slow to import and not needed when the input is cached
+    import requests
+
+    headers = dict()
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
 
-def get_input(day):
     response = requests.get(
-        INPUT_URL.format(day=day), cookies={"session": os.environ["AOC_SESSION"]}
+        get_input_url().format(day=day),
+        cookies={"session": os.environ["AOC_SESSION"]},
+        headers=headers,
     )
+
+    if entry and response.status_code == 304:
+        return object_path.read_text()
+
     response.raise_for_status()
-    return response.text
+    text = response.text
+
+    digest = sha256(text.encode()).hexdigest()
+    object_path = cache_dir / "objects" / digest
+    if not object_path.exists():
+        _write_atomic(object_path, text)
+
+    entry = {
+        "sha256": digest,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    _write_atomic(index_path, json.dumps(entry))
+
+    return text
 
 
 def format_output(output):
@@ -23,23 +98,320 @@ def format_output(output):
     return str(output)
 
 
-def run_part(part, data):
-    sig = signature(part)
-    args = dict()
-    if "data" in sig.parameters:
-        args["data"] = data
-    if "lines" in sig.parameters:
-        lines = data.split("\n")
+def split_lines(data):
+    lines = data.split("\n")
+
+    # remove the line resulting from the last newline
+    if not lines[-1]:
+        lines.pop()
+
+    return lines
+
+
+def read_input(data):
+    return Path(data).read_text() if isinstance(data, os.PathLike) else data
+
+
+def iter_lines(data):
+    """Lazily yield the lines of the input without their line endings. A file input is read through
+    a memory map, so only the current line is ever held in memory.
+    """
+    if not isinstance(data, os.PathLike):
+        start = 0
+        while start < len(data):
+            end = data.find("\n", start)
+            if end == -1:
+                end = len(data)
+            yield data[start:end]
+            start = end + 1
+        return
+
+    import mmap
+
+    with open(data, "rb") as f:
+        # empty files can't be mapped
+        if not os.fstat(f.fileno()).st_size:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                yield line.rstrip(b"\n").decode()
+
+
+def input_digest(data):
+    import hashlib
+
+    if isinstance(data, os.PathLike):
+        with open(data, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+# engines which parts may offer, from the plain Python implementation to ones built on optional
+# dependencies (of the same name)
+ENGINES = ("python", "numpy")
+
+
+def resolve_engine(engine=None):
+    """Return the engine a part should use: `engine` itself, or plain Python if it's `None`, since
+    the others are only worth their import time on large inputs. Asking for an engine whose
+    dependency isn't installed raises ImportError.
+    """
+    from importlib.util import find_spec
+
+    if engine is None:
+        return "python"
+
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine: {engine!r}")
+
+    if engine != "python" and not find_spec(engine):
+        raise ImportError(f"the {engine} engine requires {engine}, which isn't installed")
+
+    return engine
+
+
+# work which a day's parts may share, as the name of the function in the day's module doing it and
+# the name of the argument its result is given to the parts as, in the order they're done
+STAGES = {"parse": "parsed", "solve": "solved"}
+
+
+def _cached(cache, name, data, func):
+    """Return `func()`, stored in `cache` (if given) under `name` and a hash of the input `data`."""
+    if cache is None:
+        return func()
+
+    key = name, input_digest(data)
+    if key not in cache:
+        cache[key] = func()
+    return cache[key]
+
+
+def run_stage(module, name, data, cache=None):
+    """Call the shared stage `name` (see `STAGES`) of a day's `module` like a part, storing its
+    result in `cache` (if given), so that parts sharing the cache have it done only once.
+    """
+    func = getattr(module, name)
+    return _cached(cache, f"{module.__name__}.{name}", data, lambda: run_part(func, data, cache))
+
+
+def shared_stages(module, parts):
+    """Return the names of the shared stages of a day's `module` which any of `parts` need
+    (directly, or through a later stage), in the order they're done.
+    """
+    params = set().union(*map(_param_names, parts))
+
+    stages = list()
+    for name, arg in reversed(STAGES.items()):
+        if arg in params:
+            stages.append(name)
+            params.update(_param_names(getattr(module, name)))
+
+    return stages[::-1]
+
+
+def _param_names(func):
+    # read straight from the code object where there is one, since `inspect.signature` is
+    # comparatively slow to import; other callables (partials, cached functions and so on) fall
+    # back to it
+    code = getattr(func, "__code__", None)
+    if code is None:
+        import inspect
+
+        return tuple(inspect.signature(func).parameters)
 
-        # remove the line resulting from the last newline
-        if not lines[-1]:
-            lines.pop()
+    return code.co_varnames[: code.co_argcount + code.co_kwonlyargcount]
 
-        args["lines"] = lines
+
+def run_part(part, data, cache=None, workers=None, engine=None):
+    """Call a part with the arguments it asks for by name: the raw input as `data`, the input split
+    into `lines`, a lazy iterator over the lines as `stream`, or the result of one of its module's
+    shared stages (see `STAGES`): `parse` as `parsed`, or `solve` as `solved`. The stages are
+    themselves called like parts, so `solve` may ask for `parsed`. The input may be given as a
+    string or as the path of a file, which is read only if the part asks for more than a `stream`.
+    Parts which can spread their work over several processes may also ask for `workers`, the number
+    of processes to use (`None` to work in this process), or for `engine`, the name of an
+    alternative implementation to use (`None` for plain Python; see `resolve_engine`).
+
+    Given a `cache` dict, the split lines and the results of the stages are stored in it keyed by a
+    hash of the input, so that parts sharing a cache split the input and do each stage only once.
+    Parts must then treat these as read-only.
+    """
+    params = _param_names(part)
+
+    args = dict()
+    if "data" in params:
+        args["data"] = read_input(data)
+    if "lines" in params:
+        args["lines"] = _cached(cache, "lines", data, lambda: split_lines(read_input(data)))
+    if "stream" in params:
+        args["stream"] = iter_lines(data)
+    for name, arg in STAGES.items():
+        if arg in params:
+            args[arg] = run_stage(sys.modules[part.__module__], name, data, cache)
+    if "workers" in params:
+        args["workers"] = workers
+    if "engine" in params:
+        args["engine"] = engine
+
+    if metrics.enabled:
+        with metrics.record(f"{part.__module__.rpartition('.')[2]}.{part.__name__}"):
+            return part(**args)
 
     return part(**args)
 
 
+def solve_day(day, data):
+    """Solve every part of a day, returning the answers along with the wall and CPU time taken."""
+    module = import_module(f"aoc.day{day}")
+    parts = [module.part1] + ([module.part2] if hasattr(module, "part2") else [])
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    cache = dict()
+    answers = [run_part(part, data, cache) for part in parts]
+
+    return answers, time.perf_counter() - wall, time.process_time() - cpu
+
+
+# days which take the longest to solve; these are scheduled first when running in batch so that a
+# slow day isn't left running alone at the end
+SLOW_DAYS = (6, 9, 16, 22, 23)
+
+
+def run_batch(inputs, jobs=None):
+    """Solve each day in `inputs` (a mapping of day to input data) in a process pool, returning a
+    mapping of day to the result of `solve_day` or the exception raised.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    # longest job first: known slow days in order of cost, then everything else
+    order = sorted(inputs, key=lambda d: SLOW_DAYS.index(d) if d in SLOW_DAYS else len(SLOW_DAYS))
+
+    results = dict()
+    with ProcessPoolExecutor(jobs) as executor:
+        futures = {day: executor.submit(solve_day, day, inputs[day]) for day in order}
+        try:
+            for day, future in futures.items():
+                try:
+                    results[day] = future.result()
+                except Exception as e:
+                    results[day] = e
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    return results
+
+
+def solve_part(day, name, data):
+    module = import_module(f"aoc.day{day}")
+    return run_part(getattr(module, name), data)
+
+
+def iter_parts_parallel(day, names, data):
+    """Solve the named parts of a day, each in its own process, yielding the answers in order."""
+    from multiprocessing import Pool
+
+    pool = Pool(len(names))
+    try:
+        results = [pool.apply_async(solve_part, (day, name, data)) for name in names]
+        for result in results:
+            yield result.get()
+        pool.close()
+    finally:
+        # stop any part which is still running if we're leaving early due to an error or interrupt
+        pool.terminate()
+        pool.join()
+
+
+def _call_recorded(func, chunk):
+    """Call `func` on a chunk in a worker process, returning its result along with the metrics it
+    recorded.
+    """
+    with metrics.collect(), metrics.record("chunk") as entry:
+        result = func(chunk)
+
+    return result, entry
+
+
+def map_chunks(func, items, workers, initializer=None, initargs=()):
+    """Split the sequence `items` into chunks and call `func` on each chunk in a pool of `workers`
+    processes, returning the results in chunk order. State which every chunk needs (and which is
+    expensive to send) should be handed to each worker once with `initializer` and `initargs`.
+
+    While metrics are being collected, the metrics recorded by each chunk are merged into the
+    record of the part calling this.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    # several chunks per worker so that uneven chunks even out
+    size = max(-(-len(items) // (4 * workers)), 1)
+    chunks = [items[idx : idx + size] for idx in range(0, len(items), size)]
+
+    with ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs) as executor:
+        try:
+            if not metrics.enabled:
+                return list(executor.map(func, chunks))
+
+            results = list()
+            for result, entry in executor.map(partial(_call_recorded, func), chunks):
+                metrics.merge(entry)
+                results.append(result)
+
+            return results
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def benchmark_part(part, data, repeat=10, warmup=1, workers=None, engine=None):
+    """Time `repeat` runs of a part (after `warmup` untimed runs), returning summary statistics in
+    seconds along with the individual timings.
+    """
+    from math import ceil
+    from statistics import median
+
+    for _ in range(warmup):
+        run_part(part, data, workers=workers, engine=engine)
+
+    times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_part(part, data, workers=workers, engine=engine)
+        times.append(time.perf_counter() - start)
+
+    times.sort()
+
+    return {
+        "min": times[0],
+        "median": median(times),
+        # nearest-rank percentile
+        "p95": times[max(ceil(0.95 * len(times)) - 1, 0)],
+        "times": times,
+    }
+
+
+def compare_benchmarks(results, baseline, threshold):
+    """Compare median timings against a baseline, yielding `(result, baseline median, relative
+    change, regressed)` for every part present in both. A part has regressed if its median is slower
+    than the baseline's by more than `threshold` (a fraction, e.g. 0.1 for 10%).
+    """
+    baseline_medians = {
+        (b["day"], b["part"], b.get("scale")): b["median"] for b in baseline["results"]
+    }
+
+    for result in results:
+        base = baseline_medians.get((result["day"], result["part"], result.get("scale")))
+        if base is None:
+            continue
+
+        change = result["median"] / base - 1 if base else 0.0
+        yield result, base, change, change > threshold
+
+
 def set_up_profiling():
     import atexit
     import cProfile
@@ -58,23 +430,69 @@ def set_up_profiling():
     atexit.register(exit)
 
 
-@click.command()
-@click.option("--profile", is_flag=True)
-@click.argument("day", type=int, required=True)
-def aoc(profile, day):
-    module = import_module(f"aoc.day{day}")
+def memory_profile_part(part, data, cache=None, top=10, interval=0.01, engine=None):
+    """Run a part under tracemalloc, returning its answer, its peak traced memory in bytes and the
+    `top` allocation sites by size around that peak.
+
+    Most of a part's memory has been freed by the time it returns, so a watcher thread takes a new
+    snapshot whenever the traced memory grows more than 10% past the last one.
+    """
+    return _memory_profile(lambda: run_part(part, data, cache, engine=engine), top, interval)
+
+
+def memory_profile_stage(module, name, data, cache, top=10, interval=0.01):
+    """Do a shared stage of a day (see `run_stage`) under tracemalloc like `memory_profile_part`,
+    storing its result in `cache` for the parts, so that its memory isn't charged to whichever part
+    needs it first.
+    """
+    return _memory_profile(lambda: run_stage(module, name, data, cache), top, interval)
+
 
-    data = get_input(day)
+def _memory_profile(func, top, interval):
+    import threading
+    import tracemalloc
 
-    if profile:
-        set_up_profiling()
+    snapshot = None
+    snapshot_size = 0
+    done = threading.Event()
 
+    def watch():
+        nonlocal snapshot, snapshot_size
+        while not done.wait(interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > 1.1 * snapshot_size:
+                snapshot = tracemalloc.take_snapshot()
+                snapshot_size = current
+
+    tracemalloc.start()
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
     try:
-        print(f"Part 1: {format_output(run_part(module.part1, data))}")
+        answer = func()
+    finally:
+        done.set()
+        watcher.join()
+        _, peak = tracemalloc.get_traced_memory()
+        if snapshot is None:
+            snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+        ]
+    )
+
+    return answer, peak, snapshot.statistics("lineno")[:top]
+
+
+def __getattr__(name):
+    # the CLI lives in its own module so that importing a day module doesn't import click; keep
+    # `aoc.aoc` working for anything which still refers to it here
+    if name == "aoc":
+        from aoc.cli import aoc
 
-        if hasattr(module, "part2"):
-            print(f"Part 2: {format_output(run_part(module.part2, data))}")
-    except KeyboardInterrupt:
-        import traceback, sys
+        return aoc
 
-        traceback.print_exc(file=sys.stdout)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,519 @@
+from contextlib import nullcontext
+from importlib import import_module
+import json
+from pathlib import Path
+import sys
+import time
+
+import click
+
+from aoc import (
+    ENGINES,
+    benchmark_part,
+    compare_benchmarks,
+    format_output,
+    get_input,
+    iter_parts_parallel,
+    memory_profile_part,
+    memory_profile_stage,
+    metrics,
+    resolve_engine,
+    run_batch,
+    run_part,
+    set_up_profiling,
+    shared_stages,
+)
+
+
+def print_table(header, rows):
+    widths = [max(len(str(x)) for x in column) for column in zip(header, *rows)]
+    for row in (header, *rows):
+        print("  ".join(str(x).ljust(width) for x, width in zip(row, widths)).rstrip())
+
+
+def format_size(size):
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def print_memory_report(peak, stats):
+    print(f"  Peak memory: {format_size(peak)}")
+    for stat in stats:
+        frame = stat.traceback[0]
+        size = format_size(stat.size)
+        print(f"    {frame.filename}:{frame.lineno}: {size} ({stat.count} blocks)")
+
+
+class DaysType(click.ParamType):
+    """A single day, a range of days (`1-25`), a comma-separated list of those, or `all`."""
+
+    name = "days"
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, list):
+            return value
+
+        if value == "all":
+            return list(range(1, 26))
+
+        days = set()
+        try:
+            for part in value.split(","):
+                first, _, last = part.partition("-")
+                days.update(range(int(first), int(last or first) + 1))
+        except ValueError:
+            self.fail(f"{value!r} is not a day, a range of days or 'all'", param, ctx)
+
+        if not days or not all(1 <= day <= 25 for day in days):
+            self.fail(f"{value!r} does not specify days between 1 and 25", param, ctx)
+
+        return sorted(days)
+
+
+# options controlling where puzzle inputs come from, shared by the subcommands
+INPUT_OPTIONS = [
+    click.option("--offline", is_flag=True, help="Never use the network; require a cached input."),
+    click.option("--revalidate", is_flag=True, help="Check a cached input against the server."),
+    click.option(
+        "--cache-dir",
+        type=click.Path(file_okay=False, path_type=Path),
+        help="Input cache directory (default: $AOC_CACHE_DIR or ~/.cache/aoc).",
+    ),
+]
+
+
+def input_options(func):
+    for option in reversed(INPUT_OPTIONS):
+        func = option(func)
+    return func
+
+
+def load_inputs(days, cache_dir, offline, revalidate):
+    try:
+        return {
+            day: get_input(day, cache_dir=cache_dir, offline=offline, revalidate=revalidate)
+            for day in days
+        }
+    except FileNotFoundError as e:
+        raise click.ClickException(str(e))
+
+
+def check_engine(ctx, param, value):
+    try:
+        return value and resolve_engine(value)
+    except ImportError as e:
+        raise click.BadParameter(str(e), ctx, param)
+
+
+engine_option = click.option(
+    "--engine",
+    type=click.Choice(ENGINES),
+    callback=check_engine,
+    help="Implementation for parts which have alternatives (default: python).",
+)
+
+
+class DefaultGroup(click.Group):
+    """A group which falls back to the `run` command when no subcommand is named, so that `aoc 5`
+    keeps working alongside `aoc bench 5`.
+    """
+
+    def parse_args(self, ctx, args):
+        group_options = {opt for param in self.get_params(ctx) for opt in param.opts}
+        if args and args[0] not in self.commands and args[0] not in group_options:
+            args = ["run", *args]
+        return super().parse_args(ctx, args)
+
+
+def measure_import_time(module, exclude=()):
+    """Import `module` in a fresh interpreter with `-X importtime`, returning its total import time
+    and the `(self time, name)` of every module it imported, in microseconds. Modules named in
+    `exclude` (e.g. those imported at interpreter startup) are left out.
+    """
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = 0
+    imports = list()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if name.strip() in exclude:
+            continue
+
+        # only top-level imports (no indentation) count towards the total
+        if not name.startswith("  "):
+            total += int(cumulative_us)
+        imports.append((int(self_us), name.strip()))
+
+    return total, imports
+
+
+def print_import_times(ctx, param, value):
+    if not value or ctx.resilient_parsing:
+        return
+
+    _, startup = measure_import_time("sys")
+    startup = {name for _, name in startup}
+
+    rows = list()
+    for module in ["aoc.cli"] + [f"aoc.day{day}" for day in range(1, 26)]:
+        total, imports = measure_import_time(module, startup)
+        heaviest = sorted(imports, reverse=True)[:3]
+        rows.append(
+            (
+                module,
+                f"{total / 1000:.1f}",
+                ", ".join(f"{name} {self_us / 1000:.1f}" for self_us, name in heaviest),
+            )
+        )
+
+    print_table(("Module", "Import (ms)", "Heaviest imports (self ms)"), rows)
+    ctx.exit()
+
+
+@click.group(cls=DefaultGroup)
+@click.option(
+    "--import-time",
+    is_flag=True,
+    is_eager=True,
+    expose_value=False,
+    callback=print_import_times,
+    help="Report how long the CLI and each day module take to import, then exit.",
+)
+def aoc():
+    """Advent of Code 2024 solutions."""
+
+
+@aoc.command()
+@click.option("--profile", is_flag=True)
+@input_options
+@click.option(
+    "--input",
+    "input_file",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True, path_type=Path),
+    help="Read the input from a local file instead (`-` for stdin).",
+)
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), help="Worker processes when solving several days."
+)
+@click.option(
+    "--parallel-parts", is_flag=True, help="Solve the parts of a day in separate processes."
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Worker processes for parts which can split up their work.",
+)
+@engine_option
+@click.option(
+    "--memprofile", is_flag=True, help="Report peak memory and top allocation sites per part."
+)
+@click.option(
+    "--memlimit",
+    type=click.FloatRange(min=0),
+    help="Fail if a part's peak memory exceeds this many MiB (implies --memprofile).",
+)
+@click.option("--metrics", "show_metrics", is_flag=True, help="Print the recorded metrics.")
+@click.option("--metrics-json", type=click.File("w"), help="Write the recorded metrics as JSON.")
+@click.argument("days", type=DaysType(), required=True)
+def run(
+    profile,
+    offline,
+    revalidate,
+    cache_dir,
+    input_file,
+    jobs,
+    parallel_parts,
+    workers,
+    engine,
+    memprofile,
+    memlimit,
+    show_metrics,
+    metrics_json,
+    days,
+):
+    """Solve one day, or several days in a process pool."""
+    memprofile = memprofile or memlimit is not None
+    collect_metrics = show_metrics or metrics_json
+
+    single_day_options = {
+        "--input": input_file,
+        "--profile": profile,
+        "--parallel-parts": parallel_parts,
+        "--workers": workers,
+        "--engine": engine,
+        "--memprofile": memprofile,
+        "--metrics/--metrics-json": collect_metrics,
+    }
+    if len(days) > 1 and any(single_day_options.values()):
+        used = ", ".join(name for name, value in single_day_options.items() if value)
+        raise click.UsageError(f"{used} can only be used with a single day")
+
+    if parallel_parts and (profile or memprofile or collect_metrics or workers or engine):
+        raise click.UsageError(
+            "--profile, --memprofile, --metrics, --workers and --engine can't be used with "
+            "--parallel-parts"
+        )
+
+    if workers and memprofile:
+        raise click.UsageError("--memprofile can't measure the memory of --workers processes")
+
+    if input_file == Path("-"):
+        inputs = {days[0]: sys.stdin.read()}
+    elif input_file:
+        # passed on as a path so that parts which stream their input never read it all at once
+        inputs = {days[0]: input_file}
+    else:
+        inputs = load_inputs(days, cache_dir, offline, revalidate)
+
+    if len(days) > 1:
+        start = time.perf_counter()
+        results = run_batch(inputs, jobs)
+        wall = time.perf_counter() - start
+
+        rows = list()
+        total_cpu = 0
+        for day in days:
+            result = results[day]
+            if isinstance(result, Exception):
+                rows.append((day, f"error: {result!r}", "", "", ""))
+                continue
+
+            answers, day_wall, day_cpu = result
+            total_cpu += day_cpu
+            answers = [str(answer) for answer in answers] + [""] * (2 - len(answers))
+            rows.append((day, *answers, f"{day_wall:.3f}", f"{day_cpu:.3f}"))
+
+        rows.append(("total", "", "", f"{wall:.3f}", f"{total_cpu:.3f}"))
+        print_table(("Day", "Part 1", "Part 2", "Wall (s)", "CPU (s)"), rows)
+        return
+
+    (day,) = days
+    data = inputs[day]
+    module = import_module(f"aoc.day{day}")
+
+    if profile:
+        set_up_profiling()
+
+    parts = [module.part1] + ([module.part2] if hasattr(module, "part2") else [])
+
+    if parallel_parts:
+        answers = iter_parts_parallel(day, [part.__name__ for part in parts], data)
+    else:
+        # shared between the parts so the input is split and parsed only once
+        cache = dict()
+        if memprofile:
+            answers = (memory_profile_part(part, data, cache, engine=engine) for part in parts)
+        else:
+            answers = (run_part(part, data, cache, workers, engine) for part in parts)
+
+    over_limit = list()
+
+    with metrics.collect() if collect_metrics else nullcontext() as records:
+        try:
+            if memprofile:
+                # the stages the parts share are profiled on their own first, rather than being
+                # charged to whichever part needs them first
+                for name in shared_stages(module, parts):
+                    _, peak, stats = memory_profile_stage(module, name, data, cache)
+                    print(f"Shared {name}:")
+                    print_memory_report(peak, stats)
+                    if memlimit is not None and peak > memlimit * 2**20:
+                        over_limit.append(f"shared {name}")
+
+            for part_idx, answer in enumerate(answers, 1):
+                if memprofile:
+                    answer, peak, stats = answer
+
+                print(f"Part {part_idx}: {format_output(answer)}")
+
+                if memprofile:
+                    print_memory_report(peak, stats)
+                    if memlimit is not None and peak > memlimit * 2**20:
+                        over_limit.append(f"part {part_idx}")
+        except KeyboardInterrupt:
+            import traceback
+
+            traceback.print_exc(file=sys.stdout)
+
+    if show_metrics:
+        print_table(("Record", "Metric", "Value"), list(metrics.summary_rows(records)))
+
+    if metrics_json:
+        json.dump(records, metrics_json, indent=2)
+
+    if over_limit:
+        raise click.ClickException(
+            f"peak memory of {', '.join(over_limit)} exceeded {memlimit:g} MiB"
+        )
+
+
+@aoc.command()
+@input_options
+@click.option(
+    "--scale",
+    "scales",
+    type=click.IntRange(min=1),
+    multiple=True,
+    help="Benchmark generated inputs of this scale instead of the real input (repeatable).",
+)
+@click.option("--seed", type=int, default=0, show_default=True, help="Seed for --scale inputs.")
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Worker processes for parts which can split up their work.",
+)
+@engine_option
+@click.option("-n", "--repeat", type=click.IntRange(min=1), default=10, show_default=True)
+@click.option("--warmup", type=click.IntRange(min=0), default=1, show_default=True)
+@click.option("-o", "--output", type=click.File("w"), help="Write the results as JSON.")
+@click.option(
+    "--baseline", type=click.File("r"), help="Compare against the JSON results of an earlier run."
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=0.1,
+    show_default=True,
+    help="Relative slowdown of a median (vs. --baseline) which counts as a regression.",
+)
+@click.option(
+    "--metrics",
+    "collect_metrics",
+    is_flag=True,
+    help="Add the metrics of one extra, untimed run of each part to the JSON results.",
+)
+@click.argument("days", type=DaysType(), required=True)
+@click.pass_context
+def bench(
+    ctx,
+    offline,
+    revalidate,
+    cache_dir,
+    scales,
+    seed,
+    workers,
+    engine,
+    repeat,
+    warmup,
+    output,
+    baseline,
+    threshold,
+    collect_metrics,
+    days,
+):
+    """Benchmark each part of the given days."""
+    if scales:
+        from aoc.gen import generate
+
+        inputs = {
+            (day, scale): "".join(f"{line}\n" for line in generate(day, scale, seed))
+            for day in days
+            for scale in scales
+        }
+    else:
+        real_inputs = load_inputs(days, cache_dir, offline, revalidate)
+        inputs = {(day, None): data for day, data in real_inputs.items()}
+
+    results = list()
+    for (day, scale), data in inputs.items():
+        module = import_module(f"aoc.day{day}")
+        parts = [module.part1] + ([module.part2] if hasattr(module, "part2") else [])
+
+        for part_idx, part in enumerate(parts, 1):
+            stats = benchmark_part(
+                part, data, repeat=repeat, warmup=warmup, workers=workers, engine=engine
+            )
+
+            if collect_metrics:
+                with metrics.collect() as records:
+                    run_part(part, data, workers=workers, engine=engine)
+                stats["metrics"] = records
+
+            result = {"day": day, "part": part_idx, **stats}
+            if scale:
+                result["scale"] = scale
+            results.append(result)
+
+    if output:
+        json.dump(
+            {
+                "repeat": repeat,
+                "warmup": warmup,
+                "workers": workers,
+                "engine": engine,
+                "results": results,
+            },
+            output,
+            indent=2,
+        )
+
+    header = ("Day", "Part", "Min (ms)", "Median (ms)", "P95 (ms)")
+    rows = [
+        (r["day"], r["part"], *(f"{1000 * r[stat]:.2f}" for stat in ("min", "median", "p95")))
+        for r in results
+    ]
+    if scales:
+        header = header[:2] + ("Scale",) + header[2:]
+        rows = [row[:2] + (r["scale"],) + row[2:] for row, r in zip(rows, results)]
+
+    if not baseline:
+        print_table(header, rows)
+        return
+
+    comparison = {
+        (result["day"], result["part"], result.get("scale")): (base, change, regressed)
+        for result, base, change, regressed in compare_benchmarks(
+            results, json.load(baseline), threshold
+        )
+    }
+
+    regressions = 0
+    for idx, result in enumerate(results):
+        key = result["day"], result["part"], result.get("scale")
+        if key not in comparison:
+            rows[idx] += ("", "")
+            continue
+
+        base, change, regressed = comparison[key]
+        regressions += regressed
+        rows[idx] += (f"{1000 * base:.2f}", f"{change:+.1%}" + (" !" if regressed else ""))
+
+    print_table(header + ("Baseline (ms)", "Change"), rows)
+
+    if regressions:
+        click.echo(f"{regressions} part(s) regressed by more than {threshold:.0%}", err=True)
+        ctx.exit(1)
+
+
+@aoc.command()
+@click.option(
+    "--scale",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Size relative to a real input (in records, or side length for grids).",
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("-o", "--output", type=click.File("w"), default="-", help="Output file.")
+@click.argument("day", type=click.IntRange(1, 25))
+def gen(scale, seed, output, day):
+    """Generate a synthetic input for DAY; the same scale and seed give the same input."""
+    from aoc.gen import generate
+
+    for line in generate(day, scale, seed):
+        output.write(f"{line}\n")
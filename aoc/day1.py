@@ -1,10 +1,10 @@
 from collections import Counter
 
 
-def parse(lines):
+def parse(stream):
     list1 = list()
     list2 = list()
-    for line in lines:
+    for line in stream:
         a, b = line.split()
         list1.append(int(a))
         list2.append(int(b))
@@ -12,12 +12,12 @@ def parse(lines):
     return list1, list2
 
 
-def part1(lines):
-    list1, list2 = parse(lines)
+def part1(parsed):
+    list1, list2 = parsed
     return sum(abs(a - b) for a, b in zip(sorted(list1), sorted(list2)))
 
 
-def part2(lines):
-    list1, list2 = parse(lines)
+def part2(parsed):
+    list1, list2 = parsed
     counts = Counter(list2)
     return sum(x * counts[x] for x in list1)
@@ -1,57 +1,84 @@
-from collections import defaultdict
-from itertools import product
+from functools import reduce
+import operator
 
+from aoc import resolve_engine
 
-def run(lines, summit_transform):
-    lines = [[int(x) for x in line] for line in lines]
 
-    h = len(lines)
-    w = len(lines[0])
+def run(lines, summit_value, combine, score):
+    """Propagate a value from each summit (`summit_value` of its row and column) down the good
+    trails to the trailheads, combining the values arriving at each position from its neighbors,
+    and total the scores of the trailheads.
+    """
+    # heights flattened into a single list with a border of -1 all the way around, so that the four
+    # neighbors of a position are always at these offsets (and in range)
+    w = len(lines[0]) + 2
+    border = [-1] * w
+    grid = border + [x for line in lines for x in (-1, *map(int, line), -1)] + border
+    offsets = (-w, -1, 1, w)
 
-    # mapping of positions at a certain height to which summits are reachable via a "good" trail;
-    # repeated summits in the list represent different paths to that summit
-    reachable = defaultdict(list)
+    # positions bucketed by height, so that each step down visits only the positions it needs
+    by_height = [list() for _ in range(10)]
+    for pos, height in enumerate(grid):
+        if height >= 0:
+            by_height[height].append(pos)
 
-    # initially populate with the summits themselves (height 9)
-    reachable.update(
-        {
-            (r, c): [(r, c)]
-            for r, line in enumerate(lines)
-            for c, char in enumerate(line)
-            if char == 9
-        }
-    )
+    # mapping of positions at a certain height to the combined value of the summits reachable from
+    # them via a "good" trail; initially the summits themselves (height 9)
+    values = {pos: summit_value(*divmod(pos, w)) for pos in by_height[9]}
 
-    # iterate, decreasing in height by one step until we reach the bottom
+    # iterate, decreasing in height by one step until we reach the bottom; every iteration, replace
+    # the mapping with data only for the height of interest (and only for positions which can reach
+    # a summit), so that a neighbor in the mapping is exactly a next step on a good trail
     for height in reversed(range(9)):
-        # every iteration, replace the structure with data only for the height of interest so that
-        # at the end, we have data only for the trailheads
-        new_reachable = defaultdict(list)
+        new_values = dict()
+        for pos in by_height[height]:
+            reachable = [values[pos + offset] for offset in offsets if pos + offset in values]
+            if reachable:
+                new_values[pos] = reduce(combine, reachable)
 
-        for r, c in product(range(h), range(w)):
-            # if not the height of interest for this iteration, skip
-            if lines[r][c] != height:
-                continue
+        values = new_values
 
-            # consider each neighbor
-            for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-                # if out of bounds or not path of a "good" trail, skip
-                if not (0 <= r + dr < h and 0 <= c + dc < w) or lines[r + dr][c + dc] != height + 1:
-                    continue
+    return sum(map(score, values.values()))
 
-                # add the reachable summits to this position
-                new_reachable[r, c].extend(reachable[r + dr, c + dc])
 
-        reachable = new_reachable
+def part1(lines):
+    # the reachable summits as a bitset, one bit per summit; the trailhead's score is the number of
+    # distinct summits
+    #
+    # a summit can only be reached from positions at most 9 steps away, so the summits reachable
+    # from one position are less than 19 rows and 19 columns apart; numbering the bits by row and
+    # column modulo 19 then keeps them distinct while every bitset stays at most 361 bits wide
+    return run(lines, lambda r, c: 1 << (r % 19 * 19 + c % 19), operator.or_, int.bit_count)
 
-    return sum(len(summit_transform(summits)) for summits in reachable.values())
 
+def run_numpy(lines):
+    """Count the paths from the trailheads to the summits, like `run` for part 2, but with whole
+    arrays at a time: the count at each position is the sum of the counts of its neighbors one
+    higher, which are found by shifting the array of counts in each of the four directions.
+    """
+    import numpy as np
+
+    # the digit characters as their byte values, less the value of "0"
+    grid = np.frombuffer("".join(lines).encode(), dtype=np.uint8).reshape(len(lines), -1) - ord("0")
+
+    # a trail is at most 10 positions long, so a count is at most 4**9 and the total fits easily
+    counts = (grid == 9).astype(np.int64)
+    for height in reversed(range(9)):
+        new_counts = np.zeros_like(counts)
+        new_counts[1:, :] += counts[:-1, :]
+        new_counts[:-1, :] += counts[1:, :]
+        new_counts[:, 1:] += counts[:, :-1]
+        new_counts[:, :-1] += counts[:, 1:]
+
+        # only the counts from the height above are non-zero, so only they have been added
+        counts = np.where(grid == height, new_counts, 0)
+
+    return int(counts.sum())
 
-def part1(lines):
-    # `set` will uniquify the reachable summits to give the trailhead's score
-    return run(lines, set)
 
+def part2(lines, engine=None):
+    if resolve_engine(engine) == "numpy":
+        return run_numpy(lines)
 
-def part2(lines):
-    # `list` (essentially a no-op transform) to give the trailhead's rating
-    return run(lines, list)
+    # the number of paths to any summit, to give the trailhead's rating
+    return run(lines, lambda r, c: 1, operator.add, int)
@@ -1,26 +1,41 @@
+from collections import Counter
 from functools import cache
-from math import floor, log10
+
+from aoc import metrics
+
+
+@cache
+def blink(stone):
+    """Return the stones which `stone` becomes after a blink; shared between calls to `run` since
+    the rules never change.
+    """
+    if stone == 0:
+        return (1,)
+
+    n_digits = len(str(stone))
+    if n_digits % 2 == 0:
+        return divmod(stone, 10 ** (n_digits // 2))
+
+    return (stone * 2024,)
 
 
 def run(data, blinks):
-    @cache
-    def count(stone, n):
-        if not n:
-            return 1
+    # the order of the stones doesn't matter, so keep only how many there are of each
+    stones = Counter(int(x) for x in data.split())
 
-        if stone == 0:
-            return count(1, n - 1)
+    n_distinct = list()
+    for _ in range(blinks):
+        new_stones = Counter()
+        for stone, n in stones.items():
+            for new_stone in blink(stone):
+                new_stones[new_stone] += n
 
-        n_digits = floor(log10(stone)) + 1
-        
-        if n_digits % 2 == 0:
-            factor = 10 ** (n_digits / 2)
-            return count(stone % factor, n - 1) + count(stone // factor, n - 1)
+        stones = new_stones
+        n_distinct.append(len(stones))
 
-        return count(stone * 2024, n - 1)
+    metrics.gauge("distinct stones per blink", n_distinct)
 
-    data = [int(x) for x in data.strip().split()]
-    return sum(count(stone, blinks) for stone in data)
+    return stones.total()
 
 
 def part1(data):
@@ -1,11 +1,15 @@
 import re
 
+from egcd import egcd
 
-def parse(lines):
+from aoc import resolve_engine
+
+
+def parse(stream):
     def get_numbers(line):
         return [int(x) for x in re.findall(r"\d+", line)]
 
-    it = iter(lines)
+    it = iter(stream)
     try:
         while True:
             a, b, p = next(it), next(it), next(it)
@@ -15,20 +19,69 @@ def parse(lines):
         pass
 
 
-def run(lines, dp=0):
+def solve_singular(ax, ay, bx, by, px, py):
+    """Return the fewest tokens to win the prize when A and B move the claw along the same line (so
+    that the change of basis doesn't exist), or `None` if it can't be won.
+    """
+    # the prize must be on that same line
+    if ax * py - ay * px or bx * py - by * px:
+        return None
+
+    # if the buttons don't move the claw at all, the prize had better be where it starts
+    if not (ax or ay or bx or by):
+        return 0 if not (px or py) else None
+
+    # otherwise it's enough to solve along one axis in which the buttons move the claw
+    n_a, n_b, target = (ax, bx, px) if ax or bx else (ay, by, py)
+
+    if not n_b:
+        return 3 * (target // n_a) if not target % n_a and target // n_a >= 0 else None
+    if not n_a:
+        return target // n_b if not target % n_b and target // n_b >= 0 else None
+
+    # every solution of a * n_a + b * n_b = target is a = a0 + k * da, b = b0 + k * db for integer k
+    g, m, n = egcd(n_a, n_b)
+    if target % g:
+        return None
+
+    a0, da = m * (target // g), n_b // g
+    b0, db = n * (target // g), -n_a // g
+
+    # a, b >= 0 bounds k on one or both sides
+    low, high = None, None
+    for v0, dv in ((a0, da), (b0, db)):
+        if dv > 0:
+            bound = -(v0 // dv)
+            low = bound if low is None else max(low, bound)
+        else:
+            bound = v0 // -dv
+            high = bound if high is None else min(high, bound)
+
+    if low is not None and high is not None and low > high:
+        return None
+
+    # the cost is linear in k and never negative, so it's least at the end of the range it slopes
+    # down towards (which must then be bounded), or at either end if it's flat
+    slope = 3 * da + db
+    k = high if slope < 0 or low is None else low
+
+    return 3 * (a0 + k * da) + (b0 + k * db)
+
+
+def run(stream, dp=0):
     """Change of basis algorithm."""
     sum_ = 0
-    for (ax, ay), (bx, by), (px, py) in parse(lines):
+    for (ax, ay), (bx, by), (px, py) in parse(stream):
         px += dp
         py += dp
 
         # find the determinant of the change-of-basis matrix
         det = ax * by - ay * bx
 
-        # if determinant is 0, matrix is singular (A and B are multiples of each other), but this
-        # doesn't happen in the input
+        # if determinant is 0, matrix is singular (A and B are multiples of each other)
         if not det:
-            raise NotImplementedError("This doesn't seem to happen")
+            sum_ += solve_singular(ax, ay, bx, by, px, py) or 0
+            continue
 
         # prize coordinates in the new basis (not yet scaled by determinant)
         a = by * px - bx * py
@@ -43,9 +96,57 @@ def run(lines, dp=0):
     return sum_
 
 
-def part1(lines):
-    return run(lines)
+def run_numpy(stream, dp=0):
+    """Solve all the machines at once like `run`, with Cramer's rule over columns of the numbers."""
+    import numpy as np
+
+    # every number in the input in a single pass, six to a machine
+    numbers = np.array(re.findall(r"\d+", "\n".join(stream)), dtype=np.int64).reshape(-1, 6)
+    if not len(numbers):
+        return 0
+
+    # the tokens for a machine are at most 8 * (largest button move) * (largest prize coordinate),
+    # so fall back to Python ints (slower, but exact) if that might overflow 64-bit integers
+    if 8 * int(numbers[:, :4].max()) * (int(numbers[:, 4:].max()) + dp) >= 2**63:
+        numbers = numbers.astype(object)
+
+    ax, ay, bx, by, px, py = numbers.T
+    px = px + dp
+    py = py + dp
+
+    det = ax * by - ay * bx
+    a = by * px - bx * py
+    b = ax * py - ay * px
+
+    # make the determinants positive, so that a and b are negative exactly when the prize is
+    # unreachable in that direction
+    sign = np.where(det < 0, -1, 1)
+    det, a, b = det * sign, a * sign, b * sign
+
+    singular = det == 0
+    det = np.where(singular, 1, det)
+    won = ~singular & (a >= 0) & (b >= 0) & (a % det == 0) & (b % det == 0)
+
+    # summed as Python ints, since many machines may add up to more than 64 bits
+    tokens = ((3 * a[won] + b[won]) // det[won]).sum(dtype=object)
+
+    for machine in numbers[singular].tolist():
+        machine[4] += dp
+        machine[5] += dp
+        tokens += solve_singular(*machine) or 0
+
+    return int(tokens)
+
+
+def part1(stream, engine=None):
+    if resolve_engine(engine) == "numpy":
+        return run_numpy(stream)
+
+    return run(stream)
+
 
+def part2(stream, engine=None):
+    if resolve_engine(engine) == "numpy":
+        return run_numpy(stream, 10000000000000)
 
-def part2(lines):
-    return run(lines, 10000000000000)
+    return run(stream, 10000000000000)
@@ -1,11 +1,12 @@
 from collections import defaultdict
-from itertools import count
 from math import prod
 import re
-from time import sleep
+from statistics import pvariance
 
 from egcd import egcd
 
+from aoc import resolve_engine
+
 
 HEIGHT = 103
 WIDTH = 101
@@ -15,59 +16,61 @@ def parse(lines):
     return [[int(x) for x in re.findall(r"-?\d+", line)] for line in lines]
 
 
-def part1(lines):
+def part1(lines, width=WIDTH, height=HEIGHT):
     def quadrant(x, y):
         """Return a quadrant identifier given coordinates. Identifiers are from (0, 1, 2, 3) but
         don't necessarily correspond to the familiar cartesian coordinate quadrants.
         """
-        if x == WIDTH // 2 or y == HEIGHT // 2:
+        if x == width // 2 or y == height // 2:
             return  # will ignore the None key later
-        return (2 * int(x < WIDTH // 2)) + int(y < HEIGHT // 2)
+        return (2 * int(x < width // 2)) + int(y < height // 2)
 
     counts = defaultdict(int)
 
     for px, py, vx, vy in parse(lines):
-        x = (px + 100 * vx) % WIDTH
-        y = (py + 100 * vy) % HEIGHT
+        x = (px + 100 * vx) % width
+        y = (py + 100 * vy) % height
         counts[quadrant(x, y)] += 1
 
     return prod(counts[q] for q in range(4))
 
 
-def part2(lines):
-    def printit(time):
-        occupied = {
-            ((px + time * vx) % WIDTH, (py + time * vy) % HEIGHT) for px, py, vx, vy in parse(lines)
-        }
-        print(f"Time {time}")
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                char = "*" if (x, y) in occupied else " "
-                print(char, end="")
-            print()
-
-    # uncomment this to "watch" the movement over time
-    # for time in count():
-    #     printit(time)
-    #     sleep(0.5)
-
-    # from inspection, robots cluster along x dimension at time 93
-    #                                       y dimension at time 72
-
-    tx = 93
-    ty = 72
+def min_variance_time(positions, velocities, size, engine=None):
+    """Return the time in `range(size)` at which the robots' coordinates along one axis are least
+    spread out. Along each axis, the coordinates repeat with period `size`, and the tree is a tight
+    cluster of robots, so the variance is far lower when the tree is formed than at any other time.
+    """
+    if resolve_engine(engine) == "numpy":
+        import numpy as np
+
+        times = np.arange(size)[:, np.newaxis]
+        coords = (np.array(positions) + times * np.array(velocities)) % size
+        return int(coords.var(axis=1).argmin())
+
+    return min(
+        range(size),
+        key=lambda time: pvariance([(p + time * v) % size for p, v in zip(positions, velocities)]),
+    )
+
+
+def part2(lines, width=WIDTH, height=HEIGHT, engine=None):
+    px, py, vx, vy = zip(*parse(lines))
+
+    # times (modulo the width and height) at which robots cluster along x and y
+    tx = min_variance_time(px, vx, width, engine)
+    ty = min_variance_time(py, vy, height, engine)
     dt = tx - ty
 
     # m*WIDTH + n*HEIGHT = g
-    g, m, n = egcd(WIDTH, HEIGHT)
+    g, m, n = egcd(width, height)
     assert g == 1  # ensure width and height are coprime
 
     # dt*(m*WIDTH + n*HEIGHT) = dt = tx - ty
     # dt*n*HEIGHT + ty = -dt*m*WIDTH + tx
 
     # solve for t, where t is *a* (possibly negative) time at which the tree is visible:
-    assert dt * n * HEIGHT + ty == -dt * m * WIDTH + tx  # validate the math
-    t = dt * n * HEIGHT + ty
+    assert dt * n * height + ty == -dt * m * width + tx  # validate the math
+    t = dt * n * height + ty
 
     # return the first such time
-    return t % (WIDTH * HEIGHT)
+    return t % (width * height)
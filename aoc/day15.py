@@ -1,109 +1,115 @@
-DIR_MAP = {">": (0, 1), "v": (1, 0), "^": (-1, 0), "<": (0, -1)}
+from itertools import takewhile
 
 
-def parse(lines, scale=1):
-    walls = set()
-    boxes = set()
-    robot = None
-    for r, line in enumerate(lines):
-        if not line:
-            break
-        for c, char in enumerate(line):
-            if char == "#":
-                walls.update((r, scale * c + dc) for dc in range(scale))
-            if char == "O":
-                # regardless of scale, represent boxes by their leftmost coordinate
-                boxes.add((r, scale * c))
-            if char == "@":
-                robot = r, scale * c
-
-    assert robot
-
-    moves = [DIR_MAP[char] for line in lines for char in line if line.startswith(tuple(DIR_MAP))]
-
-    return walls, boxes, robot, moves
-
+# cell codes of the warehouse grid, the same as the characters of the (scaled up) map
+EMPTY, WALL, BOX, BOX_LEFT, BOX_RIGHT = b".#O[]"
 
-def run(lines, push_boxes, scale=1):
-    walls, boxes, (r, c), moves = parse(lines, scale)
+# how each cell of the map looks when scaled up
+SCALED = {
+    1: str.maketrans({"@": "."}),
+    2: str.maketrans({"#": "##", "O": "[]", ".": "..", "@": ".."}),
+}
 
-    for dr, dc in moves:
-        # find which boxes we'll be pushing on this move, if possible
-        pushed_boxes = push_boxes(r, c, dr, dc, walls, boxes)
 
-        # `None` means we've hit a wall and can't move
-        if pushed_boxes is None:
-            continue
-
-        # move the boxes in two passes so we don't discard just-added boxes
-        for box_r, box_c in pushed_boxes:
-            boxes.discard((box_r, box_c))
-        for box_r, box_c in pushed_boxes:
-            boxes.add((box_r + dr, box_c + dc))
-
-        r += dr
-        c += dc
-
-    return sum(100 * r + c for r, c in boxes)
+def parse(lines, scale=1):
+    """Return the warehouse as a flattened grid of cell codes in a bytearray along with its width,
+    the robot's position in the grid and the moves as a single string.
+    """
+    rows = list(takewhile(bool, lines))
+    w = scale * len(rows[0])
+    robot = next(r * w + scale * row.index("@") for r, row in enumerate(rows) if "@" in row)
+    grid = bytearray("".join(rows).translate(SCALED[scale]).encode())
+    moves = "".join(lines[len(rows) + 1 :])
+
+    return grid, w, robot, moves
+
+
+def run(lines, scale=1):
+    grid, w, pos, moves = parse(lines, scale)
+    offsets = {">": 1, "v": w, "^": -w, "<": -1}
+
+    # scratch space for the boxes pushed by a move, sized for all of them so it's never outgrown
+    pushed = [0] * (grid.count(BOX) + grid.count(BOX_LEFT))
+
+    def find_pushed(ahead, d):
+        """Find the wide boxes (by their left halves) pushed vertically into the cell `ahead`, a row
+        at a time, filling in `pushed` and returning how many there are, or 0 if they're stuck.
+        """
+        pushed[0] = ahead if grid[ahead] == BOX_LEFT else ahead - 1
+        n_pushed = 1
+        idx = 0
+        while idx < n_pushed:
+            box = pushed[idx]
+            idx += 1
+            for cell_ahead in (box + d, box + 1 + d):
+                cell = grid[cell_ahead]
+                if cell == WALL:
+                    return 0
+                if cell == EMPTY:
+                    continue
 
+                new_box = cell_ahead if cell == BOX_LEFT else cell_ahead - 1
 
-def part1(lines):
-    def push_boxes(r, c, dr, dc, walls, boxes):
-        pushed_boxes = set()
+                # the boxes of each row are found in order from left to right, so a box reached
+                # from two boxes in the row behind it is found twice in succession
+                if pushed[n_pushed - 1] != new_box:
+                    pushed[n_pushed] = new_box
+                    n_pushed += 1
 
-        # look at space directly ahead
-        r += dr
-        c += dc
+        return n_pushed
 
-        while (r, c) not in walls:
-            if (r, c) not in boxes:
-                # found empty space, success!
-                return pushed_boxes
-            
-            pushed_boxes.add((r, c))
+    for move in moves:
+        d = offsets[move]
+        ahead = pos + d
+        cell = grid[ahead]
 
-            # consider the next further space
-            r += dr
-            c += dc
+        if cell == EMPTY:
+            pos = ahead
+            continue
 
+        if cell == WALL:
+            continue
 
-    return run(lines, push_boxes)
+        if cell == BOX or d in (-1, 1):
+            # the boxes ahead are in a single line; find the end of the line
+            end = ahead
+            while grid[end] in (BOX, BOX_LEFT, BOX_RIGHT):
+                end += d
 
+            if grid[end] == WALL:
+                continue
 
-def part2(lines):
-    def push_boxes(r, c, dr, dc, walls, boxes):
-        pushed_boxes = set()
+            # shift the line of boxes along one cell into the empty space
+            while end != ahead:
+                grid[end] = grid[end - d]
+                end -= d
 
-        # `front` is the set of "furthest" spaces which will be entered by the robot or a box on an
-        # iteration, initially just due to the robot
-        front = {(r + dr, c + dc)}
+            grid[ahead] = EMPTY
+            pos = ahead
+            continue
 
-        while not front & walls:
-            if not front & boxes and not {(r, c - 1) for r, c in front} & boxes:
-                # found empty spaces, success!
-                return pushed_boxes
+        # a wide box pushed vertically may push two boxes, and so on
+        n_pushed = find_pushed(ahead, d)
+        if not n_pushed:
+            continue
 
-            new_front = set()
+        # move the boxes, furthest first, so that each moves into space which is now empty
+        for idx in reversed(range(n_pushed)):
+            box = pushed[idx]
+            grid[box] = grid[box + 1] = EMPTY
+            grid[box + d] = BOX_LEFT
+            grid[box + d + 1] = BOX_RIGHT
 
-            for r, c in front:
-                # check if a new box is at this point in the front
-                new_box = {(r, c), (r, c - 1)} & boxes
+        pos = ahead
 
-                # if not, this point in the front is no longer relevant
-                if not new_box:
-                    continue
+    return sum(
+        100 * (box // w) + box % w for box, cell in enumerate(grid) if cell in (BOX, BOX_LEFT)
+    )
 
-                new_r, new_c = new_box.pop()
-                pushed_boxes.add((new_r, new_c))
 
-                # if moving vertically, add both box positions to the new front; if moving
-                # horizontally, add only the further box position (positions adjusted for the next
-                # iteration in any case)
-                if dr or dc == -1:
-                    new_front.add((new_r + dr, new_c + dc))
-                if dr or dc == 1:
-                    new_front.add((new_r + dr, new_c + 1 + dc))
+def part1(lines):
+    return run(lines)
 
-            front = new_front
 
-    return run(lines, push_boxes, 2)
+def part2(lines):
+    return run(lines, 2)
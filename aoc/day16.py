@@ -1,85 +1,114 @@
 import heapq
 
+from aoc import metrics
 
-def parse(lines):
-    tiles = set()
-    start = None
-    end = None
-    for r, line in enumerate(lines):
-        for c, char in enumerate(line):
-            if char == ".":
-                tiles.add((r, c))
-            if char == "S":
-                start = r, c
-            if char == "E":
-                end = r, c
-
-    assert start
-    assert end
-
-    tiles.add(start)
-    tiles.add(end)
 
-    return tiles, start, end
+def parse(lines):
+    # the maze flattened into a single string; it's surrounded by walls, so moving off the end of a
+    # row can't wrap around to the next
+    grid = "".join(lines)
+    return grid, len(lines[0]), grid.index("S"), grid.index("E")
 
 
-def run(lines):
-    tiles, start, end = parse(lines)
+def solve(parsed):
+    """Search the maze once for both parts, returning the lowest score and the number of tiles on
+    any of the best paths.
+    """
+    return run(*parsed)
 
-    # use a min-queue (heap) with (score, position, heading, history)
-    # history stores a set of nodes encountered on paths which led to this position
-    queue = [(0, start, (0, 1), set())]
 
-    visited = set()
+# the ways a state can be reached from the state before it, as flags of its predecessors
+FORWARD = 1  # from the tile behind, facing the same way
+CLOCKWISE = 2  # from turning clockwise on the spot
+COUNTERCLOCKWISE = 4  # from turning counterclockwise on the spot
 
-    last_score = None
-    last_pos = None
-    last_history = None  # pointer to the previous history object in memory
-    while queue:
-        score, (r, c), heading, history = heapq.heappop(queue)
 
-        # merge histories if two paths converge at the same location with the same score
-        if last_score == score and last_pos == (r, c) and last_history:
-            last_history.update(history)
+def run(grid, w, start, end):
+    """Dijkstra's algorithm over states of position and heading (numbered `4 * pos + heading`),
+    recording for each state the lowest score and the states it can be reached from with that score.
+    The tiles on the best paths are then found by walking back from the end along those links.
 
-        # if we've been here with the same heading, don't continue (redundant)
-        if ((r, c), heading) in visited:
-            continue
+    A state can only be reached in one of three ways, so its predecessors are kept as flags in a
+    byte per state, and the memory used is fixed by the size of the maze.
+    """
+    # east, south, west, north: turning clockwise is a step forward along this list
+    offsets = (1, w, -1, -w)
 
-        visited.add(((r, c), heading))
-        # this creates a _copy_ of the history object with the current location, so that we don't
-        # update the other paths' history objects
-        history = history | {(r, c)}
+    scores = [None] * (4 * len(grid))
+    predecessors = bytearray(4 * len(grid))
 
-        # success!
-        if (r, c) == end:
-            return score, len(history)
+    # starting facing east
+    start_state = 4 * start
+    scores[start_state] = 0
+    queue = [(0, start_state)]
 
-        # consider the neighboring directions
-        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            new_r = r + dr
-            new_c = c + dc
-
-            # check for the wall and prevent a 180 degree turn
-            if (new_r, new_c) not in tiles or (new_r, new_c) == last_pos:
-                continue
-
-            # otherwise add new locations and scores to the queue
-            heapq.heappush(
-                queue,
-                (score + (1 if (dr, dc) == heading else 1001), (new_r, new_c), (dr, dc), history),
-            )
+    best_score = None
+    n_pops = 0
+    while queue:
+        score, state = heapq.heappop(queue)
+        n_pops += 1
 
-        last_score = score
-        last_history = history
-        last_pos = r, c
+        # skip stale queue entries, and stop once every path as good as the best has been found
+        if score > scores[state]:
+            continue
+        if best_score is not None and score > best_score:
+            break
 
+        pos, heading = divmod(state, 4)
+        if pos == end:
+            best_score = score
+            continue
 
-def part1(lines):
-    score, _ = run(lines)
+        moves = [
+            (4 * pos + (heading + 1) % 4, 1000, CLOCKWISE),
+            (4 * pos + (heading - 1) % 4, 1000, COUNTERCLOCKWISE),
+        ]
+        if grid[pos + offsets[heading]] != "#":
+            moves.append((state + 4 * offsets[heading], 1, FORWARD))
+
+        for new_state, cost, how in moves:
+            new_score = score + cost
+            if scores[new_state] is None or new_score < scores[new_state]:
+                scores[new_state] = new_score
+                predecessors[new_state] = how
+                heapq.heappush(queue, (new_score, new_state))
+            elif new_score == scores[new_state]:
+                predecessors[new_state] |= how
+
+    metrics.count("heap pops", n_pops)
+
+    if best_score is None:
+        raise ValueError("the end of the maze can't be reached")
+
+    # walk back from the end (in whichever headings it was reached with the best score)
+    stack = [4 * end + heading for heading in range(4) if scores[4 * end + heading] == best_score]
+    seen = set(stack)
+    while stack:
+        state = stack.pop()
+        pos, heading = divmod(state, 4)
+        how = predecessors[state]
+
+        previous_states = list()
+        if how & FORWARD:
+            previous_states.append(state - 4 * offsets[heading])
+        if how & CLOCKWISE:
+            previous_states.append(4 * pos + (heading - 1) % 4)
+        if how & COUNTERCLOCKWISE:
+            previous_states.append(4 * pos + (heading + 1) % 4)
+
+        for previous_state in previous_states:
+            if previous_state not in seen:
+                seen.add(previous_state)
+                stack.append(previous_state)
+
+    return best_score, len({state // 4 for state in seen})
+
+
+def part1(solved):
+    score, _ = solved
     return score
 
 
-def part2(lines):
-    _, n_nodes = run(lines)
-    return n_nodes
+def part2(solved):
+    _, n_tiles = solved
+    return n_tiles
@@ -35,12 +35,12 @@ def run(walls):
                 queue.appendleft(((r + dr, c + dc), dist + 1))
 
 
-def part1(lines):
-    return run(parse(lines)[:1024])
+def part1(parsed):
+    return run(parsed[:1024])
 
 
-def part2(lines):
-    walls = parse(lines)
+def part2(parsed):
+    walls = parsed
 
     # bisection algorithm to find the first byte which blocks the goal completely
     # min_ is a lower bound on the index of the last byte which does not block the goal
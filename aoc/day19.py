@@ -7,8 +7,8 @@ def parse(lines):
     return tokens, targets
 
 
-def run(lines):
-    tokens, targets = parse(lines)
+def run(parsed):
+    tokens, targets = parsed
 
     max_token = max(len(token) for token in tokens)
 
@@ -68,9 +68,9 @@ def run(lines):
     return [count(target) for target in targets]
 
 
-def part1(lines):
-    return sum(count > 0 for count in run(lines))
+def part1(parsed):
+    return sum(count > 0 for count in run(parsed))
 
 
-def part2(lines):
-    return sum(run(lines))
+def part2(parsed):
+    return sum(run(parsed))
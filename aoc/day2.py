@@ -1,5 +1,5 @@
-def parse(lines):
-    for line in lines:
+def parse(stream):
+    for line in stream:
         yield [int(x) for x in line.split()]
 
 
@@ -8,13 +8,13 @@ def is_safe(data):
     return all(-3 <= x <= -1 for x in diffs) or all(1 <= x <= 3 for x in diffs)
 
 
-def part1(lines):
-    return sum(is_safe(entry) for entry in parse(lines))
+def part1(stream):
+    return sum(is_safe(entry) for entry in parse(stream))
 
 
-def part2(lines):
+def part2(stream):
     sum_ = 0
-    for entry in parse(lines):
+    for entry in parse(stream):
         for to_remove in range(len(entry)):
             new_entry = entry[:to_remove] + entry[to_remove + 1 :]
             if is_safe(new_entry):
@@ -17,8 +17,8 @@ def parse(lines):
     return maze, start, end
 
 
-def run(lines, cheat_radius):
-    maze, start, end = parse(lines)
+def run(parsed, cheat_radius):
+    maze, start, end = parsed
 
     # generate a set of relative positions reachable within the allowed radius, along with their
     # distances
@@ -65,9 +65,9 @@ def run(lines, cheat_radius):
     return len(found_cheats)
 
 
-def part1(lines):
-    return run(lines, 2)
+def part1(parsed):
+    return run(parsed, 2)
 
 
-def part2(lines):
-    return run(lines, 20)
+def part2(parsed):
+    return run(parsed, 20)
@@ -8,18 +8,18 @@ def calculate(num):
     return num
 
 
-def part1(lines):
-    def run(lines):
-        for line in lines:
+def part1(stream):
+    def run(stream):
+        for line in stream:
             num = int(line)
             for _ in range(2000):
                 num = calculate(num)
             yield num
 
-    return sum(run(lines))
+    return sum(run(stream))
 
 
-def part2(lines):
+def part2(stream):
     bananas = defaultdict(int)
 
     def run(num):
@@ -51,7 +51,7 @@ def part2(lines):
             bananas[curr_seq] += value
             seen.add(curr_seq)
 
-    for line in lines:
+    for line in stream:
         run(int(line))
 
     return max(bananas.values())
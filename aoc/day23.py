@@ -18,8 +18,8 @@ def parse(lines):
     return adj
 
 
-def part1(lines):
-    adj = parse(lines)
+def part1(parsed):
+    adj = parsed
 
     # observed 3-cliques having at least one node which starts with "t"
     seen = set()
@@ -40,8 +40,8 @@ def part1(lines):
     return len(seen)
 
 
-def part2(lines):
-    adj = parse(lines)
+def part2(parsed):
+    adj = parsed
 
     def uniqify(func):
         """Decorator which ensures only unique elements are yielded from a generator."""
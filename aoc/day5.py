@@ -34,14 +34,14 @@ def parse(lines):
     return orderings, partitioned_updates[True], partitioned_updates[False]
 
 
-def part1(lines):
-    _, good_updates, _ = parse(lines)
+def part1(parsed):
+    _, good_updates, _ = parsed
 
     return sum(update[len(update) // 2] for update in good_updates)
 
 
-def part2(lines):
-    orderings, _, bad_updates = parse(lines)
+def part2(parsed):
+    orderings, _, bad_updates = parsed
 
     def reorder(update):
         pages = set(update)
@@ -1,10 +1,13 @@
+from itertools import pairwise
+
+from aoc import map_chunks, metrics
+
+
 def parse_map(lines):
     h = len(lines)
     w = len(lines[0])
     walls = {(r, c) for r, line in enumerate(lines) for c, char in enumerate(line) if char == "#"}
-    start = next(
-        (r, c) for r, line in enumerate(lines) for c, char in enumerate(line) if char == "^"
-    )
+    start = next((r, line.index("^")) for r, line in enumerate(lines) if "^" in line)
 
     return h, w, walls, start
 
@@ -20,7 +23,7 @@ def handle_walls(r, c, dr, dc, walls):
 
 
 def part1(lines):
-    w, h, walls, (r, c) = parse_map(lines)
+    h, w, walls, (r, c) = parse_map(lines)
 
     # up initially
     dr, dc = -1, 0
@@ -38,49 +41,137 @@ def part1(lines):
     return len(visited)
 
 
-def part2(lines):
-    w, h, walls, (r, c) = parse_map(lines)
-
-    # up initially
-    dr, dc = -1, 0
+# directions in turning order, so that turning right is a step forward in this list
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+
+def build_jumps(h, w, walls):
+    """Precompute where the guard stops when walking straight from each cell in each direction.
+
+    Cells are numbered `r * w + c`, and `jumps[d][pos]` is the cell just short of the next wall
+    from `pos` in direction `DIRECTIONS[d]`, or -1 if the guard would leave the map instead.
+    """
+    jumps = [[-1] * (h * w) for _ in DIRECTIONS]
+    up, right, down, left = jumps
+
+    walls_by_row = [[] for _ in range(h)]
+    walls_by_col = [[] for _ in range(w)]
+    for r, c in sorted(walls):
+        walls_by_row[r].append(c)
+        walls_by_col[c].append(r)
+
+    # every cell in a run between two walls (or the edges) stops at the same places, so fill in the
+    # runs with slice assignments rather than cell by cell
+    for c, rows in enumerate(walls_by_col):
+        for above, below in pairwise([-1, *rows, h]):
+            run = slice((above + 1) * w + c, below * w + c, w)
+            n = below - above - 1
+            up[run] = [(above + 1) * w + c if above >= 0 else -1] * n
+            down[run] = [(below - 1) * w + c if below < h else -1] * n
+
+    for r, cols in enumerate(walls_by_row):
+        for before, after in pairwise([-1, *cols, w]):
+            run = slice(r * w + before + 1, r * w + after)
+            n = after - before - 1
+            left[run] = [r * w + before + 1 if before >= 0 else -1] * n
+            right[run] = [r * w + after - 1 if after < w else -1] * n
+
+    return jumps
+
+
+def is_loop(jumps, w, pos, d, obstacle):
+    """Determine whether the guard walking from cell `pos` in direction `d` gets stuck in a loop,
+    with an extra wall at the cell `obstacle`.
+
+    The guard jumps straight from wall to wall, and the extra wall is overlaid on each jump by
+    checking whether it lies between the start and end of the jump. Only the turns are recorded;
+    if the guard turns at the same place in the same direction twice, it is in a loop.
+    """
+    obstacle_r, obstacle_c = divmod(obstacle, w)
+    turns = set()
+
+    while True:
+        r, c = divmod(pos, w)
+        stop = jumps[d][pos]
+
+        # the extra wall cuts the jump short if it lies between here and the stop (or the edge)
+        match d:
+            case 0:
+                if obstacle_c == c and obstacle < pos and (stop < 0 or stop <= obstacle):
+                    stop = obstacle + w
+            case 1:
+                if obstacle_r == r and obstacle > pos and (stop < 0 or stop >= obstacle):
+                    stop = obstacle - 1
+            case 2:
+                if obstacle_c == c and obstacle > pos and (stop < 0 or stop >= obstacle):
+                    stop = obstacle - w
+            case 3:
+                if obstacle_r == r and obstacle < pos and (stop < 0 or stop <= obstacle):
+                    stop = obstacle + 1
+
+        if stop < 0:
+            return False
+
+        if (stop, d) in turns:
+            return True
+
+        turns.add((stop, d))
+        pos = stop
+        d = (d + 1) % 4
+
+
+def candidate_walls(h, w, walls, start):
+    """Walk the guard's original path, returning `(pos, d, obstacle)` for each cell `obstacle` the
+    guard walks into, at the point `pos` (facing direction `d`) where it first does so.
+
+    A wall in a cell the guard has already walked through would have changed the path to here, so
+    the guard can only meet a new wall at `obstacle` from here; if it loops, it must do so from
+    here.
+    """
+    (r, c), d = start, 0
 
     # set of positions we've already considered (or disqualified) for a new wall
-    considered = {(r, c)}
+    considered = {start}
 
-    visited = set()
-    count = 0
+    candidates = list()
+    while True:
+        dr, dc = DIRECTIONS[d]
+        while (r + dr, c + dc) in walls:
+            d = (d + 1) % 4
+            dr, dc = DIRECTIONS[d]
 
-    def is_loop(visited, r, c, dir_, walls):
-        dr, dc = dir_
-        visited = set(visited)  # copy so we don't pollute the source
-        while 0 <= r < h and 0 <= c < w:
-            # if we've been here while facing the same direction already, this is a loop
-            if (r, c, dr, dc) in visited:
-                return True
+        new_r, new_c = r + dr, c + dc
+        if not (0 <= new_r < h and 0 <= new_c < w):
+            return candidates
 
-            visited.add((r, c, dr, dc))
-            dr, dc = handle_walls(r, c, dr, dc, walls)
+        if (new_r, new_c) not in considered:
+            candidates.append((r * w + c, d, new_r * w + new_c))
+            considered.add((new_r, new_c))
 
-            r += dr
-            c += dc
+        r, c = new_r, new_c
 
-        return False
 
-    while 0 <= r < h and 0 <= c < w:
-        visited.add((r, c, dr, dc))
-        dr, dc = handle_walls(r, c, dr, dc, walls)
+# jump table and map width in worker processes, sent once per worker rather than with every chunk
+_worker_state = None
 
-        # consider a new wall directly ahead of us
-        new_wall = (r + dr, c + dc)
 
-        if new_wall not in considered and is_loop(
-            visited, r, c, TURN_MAP[dr, dc], walls | {new_wall}
-        ):
-            count += 1
+def set_up_worker(jumps, w):
+    global _worker_state
+    _worker_state = jumps, w
 
-        considered.add(new_wall)
 
-        r += dr
-        c += dc
+def count_loops(candidates):
+    jumps, w = _worker_state
+    return sum(is_loop(jumps, w, pos, d, obstacle) for pos, d, obstacle in candidates)
+
+
+def part2(lines, workers=None):
+    h, w, walls, start = parse_map(lines)
+    jumps = build_jumps(h, w, walls)
+    candidates = candidate_walls(h, w, walls, start)
+    metrics.count("is_loop calls", len(candidates))
+
+    if workers:
+        return sum(map_chunks(count_loops, candidates, workers, set_up_worker, (jumps, w)))
 
-    return count
+    return sum(is_loop(jumps, w, pos, d, obstacle) for pos, d, obstacle in candidates)
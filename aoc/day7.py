@@ -1,33 +1,101 @@
-from itertools import product
-import operator
+from functools import partial
 
-def parse(lines):
-    for line in lines:
+from aoc import map_chunks, metrics
+
+
+def parse(stream):
+    for line in stream:
         target, rest = line.split(":")
         inputs = rest.split()
         yield int(target), [int(x) for x in inputs]
 
-def run(lines, *operations):
 
-    def is_valid(target, inputs):
-        start = inputs.pop(0)
-        for ops in product(operations, repeat=len(inputs)):
-            value = start
+# Each operation is undone by an "inverse", which, given the result of the operation and its right
+# operand, returns the left operand, or `None` if the operation couldn't have produced the result.
+# All the values are non-negative, so a value can only be subtracted from one at least as big.
+
+# returned when the left operand could be anything, as when multiplying by zero gives zero
+ANY = object()
+
+
+def unadd(value, operand):
+    if value >= operand:
+        return value - operand
+
+
+def unmul(value, operand):
+    if not operand:
+        return ANY if not value else None
+
+    if not value % operand:
+        return value // operand
+
+
+def unconcat(value, operand):
+    # the power of ten just above the operand, so that `operand` is the last digits of `value`
+    shift = 10
+    while shift <= operand:
+        shift *= 10
+
+    if value % shift == operand:
+        return value // shift
+
+
+def is_valid(target, inputs, inverses):
+    """Work backwards from the target, undoing the operations in every possible way starting from
+    the last operand; a branch ends as soon as an operation can't be undone, which prunes most of
+    the combinations right away. Returns whether the equation is valid along with the number of
+    states tried.
+    """
+    n_tried = 0
+    stack = [(target, len(inputs) - 1)]
+    while stack:
+        n_tried += 1
+        value, idx = stack.pop()
+        if not idx:
+            if value == inputs[0]:
+                return True, n_tried
+            continue
+
+        operand = inputs[idx]
+        for inverse in inverses:
+            previous = inverse(value, operand)
+
+            # whatever the operands before this one make, this operation turns it into `value`
+            if previous is ANY:
+                return True, n_tried
+
+            if previous is not None:
+                stack.append((previous, idx - 1))
+
+    return False, n_tried
+
+
+def sum_valid(equations, inverses):
+    total = 0
+    n_tried = 0
+    for target, inputs in equations:
+        valid, n = is_valid(target, inputs, inverses)
+        n_tried += n
+        if valid:
+            total += target
 
-            for op, operand in zip(ops, inputs):
-                value = op(value, operand)
+    metrics.count("states tried", n_tried)
+    return total
 
-            if value == target:
-                return True
 
-    return sum(target for target, inputs in parse(lines) if is_valid(target, inputs))
+def run(stream, *inverses, workers=None):
+    if not workers:
+        return sum_valid(parse(stream), inverses)
 
+    # the equations are independent, so check chunks of them in parallel; the chunk sums come back
+    # in order and are exact integers, so the total doesn't depend on the number of workers
+    equations = list(parse(stream))
+    return sum(map_chunks(partial(sum_valid, inverses=inverses), equations, workers))
 
-def part1(lines):
-    return run(lines, operator.add, operator.mul)
 
-def part2(lines):
-    def concat(x, y):
-        return int(str(x) + str(y))
+def part1(stream, workers=None):
+    return run(stream, unadd, unmul, workers=workers)
 
-    return run(lines, operator.add, operator.mul, concat)
+def part2(stream, workers=None):
+    return run(stream, unadd, unmul, unconcat, workers=workers)
@@ -1,123 +1,116 @@
-from dataclasses import dataclass
-from functools import total_ordering
-from itertools import accumulate, chain, repeat, zip_longest
+from array import array
+from heapq import heappop, heappush
+from itertools import accumulate
 
 
-def part1(data):
-    data = [int(x) for x in data.strip()]
+# translation of the digit characters to the byte values 0-9
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
 
-    # assert that free space indicators exist only between file indicators
-    assert len(data) % 2 == 1
 
-    n_files = len(data) // 2 + 1
-    total_block_size = sum(data[::2])
+def parse(data):
+    """Return the disk map as bytes holding the value of each digit."""
+    return data.strip().encode().translate(DIGITS)
 
-    # create an iterator which yields labeled file blocks and blanks from left to right from the
-    # original orientation; blanks are represented by `None`s
-    forward_generators = chain.from_iterable(
-        (repeat(file_idx, a), repeat(None, b or 0))
-        for file_idx, (a, b) in enumerate(zip_longest(data[::2], data[1::2]))
-    )
-    forward_it = chain.from_iterable(forward_generators)
 
-    # create an iterator which file labeled blocks (only) from _right to left_ from the original
-    # orientation
-    reverse_generators = chain(
-        repeat(n_files - file_idx - 1, x) for file_idx, x in enumerate(data[::-2])
-    )
-    reverse_it = chain.from_iterable(reverse_generators)
+def span_checksum(label, start, length):
+    """Return the checksum of a run of `length` blocks of file `label` starting at block `start`,
+    i.e. `label` times the sum of the arithmetic series `start`, ..., `start + length - 1`.
+    """
+    return label * (start * length + length * (length - 1) // 2)
 
-    def next_block():
-        """Return the next file block from the forward iterator, or the reverse iterator if we hit a
-        blank.
-        """
-        block = next(forward_it)
-        if block is None:
-            block = next(reverse_it)
 
-        return block
+def part1(parsed):
+    data = parsed
+
+    # assert that free space indicators exist only between file indicators
+    assert len(data) % 2 == 1
 
-    return sum(block_idx * next_block() for block_idx in range(total_block_size))
+    # walk files in from the left, filling each blank after one with runs of blocks taken from the
+    # files at the right, until the two meet
+    left = 0
+    right = len(data) // 2
+    right_remaining = data[-1]
 
+    pos = 0
+    checksum = 0
+    while left < right:
+        checksum += span_checksum(left, pos, data[2 * left])
+        pos += data[2 * left]
 
-def part2(data):
-    data = [int(x) for x in data.strip()]
+        blank = data[2 * left + 1]
+        while blank and right > left:
+            length = min(blank, right_remaining)
+            checksum += span_checksum(right, pos, length)
+            pos += length
+            blank -= length
+            right_remaining -= length
 
-    @total_ordering
-    @dataclass
-    class Block:
-        start: int
-        length: int
-        label: int | None = None
+            if not right_remaining:
+                right -= 1
+                right_remaining = data[2 * right]
 
-        def __lt__(self, other):
-            return self.start < other.start
+        left += 1
 
-        @property
-        def end(self):
-            return self.start + self.length
+    # whatever is left of the file where the two met stays put
+    if left == right:
+        checksum += span_checksum(right, pos, right_remaining)
+
+    return checksum
+
+
+def part2(parsed):
+    data = parsed
 
     # assert that free space indicators exist only between file indicators
     assert len(data) % 2 == 1
 
-    # list of locations of initial file starts
-    file_starts = [0]
-    file_starts.extend(accumulate(data))
-
-    files = [
-        Block(file_pos, file_len, file_idx)
-        for file_idx, (file_len, file_pos) in enumerate(zip(data[::2], file_starts[::2]))
-    ]
-
-    blanks = [
-        Block(blank_pos, blank_len)
-        for blank_pos, blank_len in zip(file_starts[1::2], data[1::2])
-        if blank_len  # ignore empty blank spaces (i.e. no blank)
-    ]
-
-    file_map = {file.label: file for file in files}
-
-    for file_idx in reversed(range(len(files))):
-        file = file_map[file_idx]
-        try:
-            blank = next(
-                blank
-                for blank in blanks
-                if blank.start < file.start and blank.length >= file.length
-            )
-        except StopIteration:
+    # start of each file and blank space in the original disk map
+    starts = array("q", accumulate(data, initial=0))
+
+    # columns of the files, indexed by label; only the starts change
+    file_starts = starts[::2]
+    file_lengths = data[::2]
+
+    # index of blank spaces by length: the starts of the original blanks of each length, in order
+    # and used up from the front, plus a min-heap of the starts of what's left of partly filled
+    # blanks; the leftmost blank that fits a file is then the smallest of the heads for lengths it
+    # fits in
+    blanks = [array("q") for _ in range(10)]
+    for blank_pos, blank_len in zip(starts[1::2], data[1::2]):
+        if blank_len:  # ignore empty blank spaces (i.e. no blank)
+            blanks[blank_len].append(blank_pos)
+    del starts
+
+    next_blanks = [0] * len(blanks)
+    leftovers = [list() for _ in blanks]
+
+    # files only ever move left, so the space a file leaves behind is to the right of every file yet
+    # to be moved and can never be used; it doesn't need to go into the index
+    for label in reversed(range(len(file_starts))):
+        file_len = file_lengths[label]
+        blank_pos = file_starts[label]
+        blank_len = 0
+        for length in range(file_len, len(blanks)):
+            idx = next_blanks[length]
+            if idx < len(blanks[length]) and blanks[length][idx] < blank_pos:
+                blank_pos, blank_len, leftover = blanks[length][idx], length, False
+            if leftovers[length] and leftovers[length][0] < blank_pos:
+                blank_pos, blank_len, leftover = leftovers[length][0], length, True
+
+        if not blank_len:
             continue
 
-        # create a new blank where the file was
-        new_blank = Block(file.start, file.length)
-
-        # move file to where the blank was
-        file.start = blank.start
-        files.sort()
-
-        # shrink old blank and remove it if it's completely occupied now
-        blank.start += file.length
-        blank.length -= file.length
-        if not blank.length:
-            blanks.remove(blank)
-
-        # attempt to merge new blank with adjacent blanks
-        try:
-            left_blank = next(blank for blank in blanks if blank.end == new_blank.start)
-            new_blank.start = left_blank.start
-            new_blank.length += left_blank.length
-            blanks.remove(left_blank)
-        except StopIteration:
-            pass
-
-        try:
-            right_blank = next(blank for blank in blanks if blank.start == new_blank.end)
-            new_blank.length += right_blank.length
-            blanks.remove(right_blank)
-        except StopIteration:
-            pass
-
-        blanks.append(new_blank)
-        blanks.sort()
-
-    return sum(file.label * x for file in files for x in range(file.start, file.end))
+        # move file to where the blank was, and put what's left of the blank back into the index
+        if leftover:
+            heappop(leftovers[blank_len])
+        else:
+            next_blanks[blank_len] += 1
+
+        file_starts[label] = blank_pos
+        if blank_len > file_len:
+            heappush(leftovers[blank_len - file_len], blank_pos + file_len)
+
+    return sum(
+        span_checksum(label, file_start, file_len)
+        for label, (file_start, file_len) in enumerate(zip(file_starts, file_lengths))
+    )
@@ -0,0 +1,524 @@
+"""Generators of synthetic puzzle inputs, for measuring how the solutions scale.
+
+Each `dayN(rng, scale)` yields the lines of a valid input for that day, drawing only from `rng` so
+that the output is determined by the seed. `scale` multiplies the number of records for list-like
+inputs and the side length for grid inputs, with `scale=1` being roughly the size of a real input.
+Some days have fixed dimensions built into their solutions (days 14, 17, 18 and 24), in which case
+only the number of records grows, if anything.
+"""
+
+from collections import deque
+from itertools import product
+import random
+from string import ascii_letters, ascii_lowercase, digits
+
+
+def generate(day, scale=1, seed=0):
+    """Yield the lines of a generated input for `day`."""
+    return globals()[f"day{day}"](random.Random(seed), scale)
+
+
+def _grid_lines(grid):
+    for row in grid:
+        yield "".join(row)
+
+
+def _maze(rng, size):
+    """Return a perfect maze (a spanning tree of the odd cells) as a grid of "#" and "." of the
+    given odd size, carved with an iterative randomized depth-first search.
+    """
+    grid = [["#"] * size for _ in range(size)]
+    grid[1][1] = "."
+    stack = [(1, 1)]
+    while stack:
+        r, c = stack[-1]
+        options = [
+            (r + dr, c + dc)
+            for dr, dc in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < r + dr < size - 1 and 0 < c + dc < size - 1 and grid[r + dr][c + dc] == "#"
+        ]
+        if not options:
+            stack.pop()
+            continue
+
+        new_r, new_c = rng.choice(options)
+        grid[(r + new_r) // 2][(c + new_c) // 2] = "."
+        grid[new_r][new_c] = "."
+        stack.append((new_r, new_c))
+
+    return grid
+
+
+def day1(rng, scale):
+    for _ in range(1000 * scale):
+        yield f"{rng.randrange(10000, 100000)}   {rng.randrange(10000, 100000)}"
+
+
+def day2(rng, scale):
+    for _ in range(1000 * scale):
+        value = rng.randint(1, 90)
+        direction = rng.choice((-1, 1))
+        report = [value]
+        for _ in range(rng.randint(4, 7)):
+            # mostly gradual changes in one direction, with the occasional bad level
+            step = direction * rng.randint(1, 3) if rng.random() < 0.9 else rng.randint(-4, 4)
+            value = max(value + step, 1)
+            report.append(value)
+        yield " ".join(str(x) for x in report)
+
+
+def day3(rng, scale):
+    noise = list("[](){}<>!@#$%^&*+-/?,;:'~ ") + ["what()", "from()", "select()", "who()", "mul"]
+    for _ in range(6 * scale):
+        tokens = list()
+        length = 0
+        while length < 3000:
+            x = rng.random()
+            if x < 0.1:
+                token = f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+            elif x < 0.12:
+                token = "do()"
+            elif x < 0.14:
+                token = "don't()"
+            elif x < 0.16:
+                # near misses which must not be counted
+                token = rng.choice(["mul(4*", "mul ( 2, 3)", "mul(1234,5)", "mul[3,7]", "do_not()"])
+            else:
+                token = rng.choice(noise)
+            tokens.append(token)
+            length += len(token)
+        yield "".join(tokens)
+
+
+def day4(rng, scale):
+    size = 140 * scale
+    for _ in range(size):
+        yield "".join(rng.choices("XMAS", k=size))
+
+
+def day5(rng, scale):
+    # every pair of pages has a rule, so each update has a single correct order
+    pages = rng.sample(range(10, 100), 49)
+    rules = [(a, b) for idx, a in enumerate(pages) for b in pages[idx + 1 :]]
+    rng.shuffle(rules)
+    for a, b in rules:
+        yield f"{a}|{b}"
+
+    yield ""
+
+    for _ in range(200 * scale):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        yield ",".join(str(x) for x in update)
+
+
+def day6(rng, scale):
+    size = 130 * scale
+    walls = {(r, c) for r, c in product(range(size), repeat=2) if rng.random() < 0.03}
+
+    def walk(start):
+        """Return the number of positions visited from `start`, or 0 if the guard never leaves."""
+        (r, c), (dr, dc) = start, (-1, 0)
+        seen = set()
+        while 0 <= r < size and 0 <= c < size:
+            if (r, c, dr, dc) in seen:
+                return 0
+            seen.add((r, c, dr, dc))
+            if (r + dr, c + dc) in walls:
+                dr, dc = dc, -dr
+            else:
+                r += dr
+                c += dc
+        return len({(r, c) for r, c, _, _ in seen})
+
+    # the solution expects the guard to leave the map; of those starts, pick one with a long walk
+    # so that there are plenty of candidate obstacles
+    starts = list()
+    while len(starts) < 50:
+        start = rng.randrange(size), rng.randrange(size)
+        if start not in walls and (visited := walk(start)):
+            starts.append((visited, start))
+    _, start = max(starts)
+
+    for r in range(size):
+        yield "".join(
+            "^" if (r, c) == start else "#" if (r, c) in walls else "." for c in range(size)
+        )
+
+
+def day7(rng, scale):
+    for _ in range(850 * scale):
+        # mostly small operands, and targets of at most 15 digits, like the real thing
+        while True:
+            n_operands = rng.randint(3, 12)
+            limits = (9, 9, 9, 99, 99, 999)
+            operands = [rng.randint(1, rng.choice(limits)) for _ in range(n_operands)]
+            target = operands[0]
+            for operand in operands[1:]:
+                match rng.randrange(3):
+                    case 0:
+                        target += operand
+                    case 1:
+                        target *= operand
+                    case 2:
+                        target = int(f"{target}{operand}")
+            if target < 10**15:
+                break
+
+        # make some of the equations (probably) impossible
+        if rng.random() < 0.4:
+            target += rng.randint(1, 100)
+
+        yield f"{target}: {' '.join(str(x) for x in operands)}"
+
+
+def day8(rng, scale):
+    size = 50 * scale
+    frequencies = digits + ascii_letters
+    grid = [["."] * size for _ in range(size)]
+    for _ in range(size * size * 7 // 100):
+        grid[rng.randrange(size)][rng.randrange(size)] = rng.choice(frequencies)
+    yield from _grid_lines(grid)
+
+
+def day9(rng, scale):
+    n_files = 10000 * scale
+    yield "".join(
+        str(rng.randint(1, 9)) + (str(rng.randint(0, 9)) if idx < n_files - 1 else "")
+        for idx in range(n_files)
+    )
+
+
+def day10(rng, scale):
+    size = 50 * scale
+    summits = [(rng.randrange(size), rng.randrange(size)) for _ in range(size * size // 100)]
+
+    # distance to the nearest summit, out as far as the hills go
+    distances = dict.fromkeys(summits, 0)
+    queue = deque(distances)
+    while queue:
+        r, c = queue.popleft()
+        if distances[r, c] == 9:
+            continue
+        for pos in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+            if 0 <= pos[0] < size and 0 <= pos[1] < size and pos not in distances:
+                distances[pos] = distances[r, c] + 1
+                queue.append(pos)
+
+    # hills which fall away from each summit in steps of one, with some noise to break up trails
+    grid = list()
+    for r in range(size):
+        row = list()
+        for c in range(size):
+            distance = distances.get((r, c), 9)
+            height = max(9 - distance, 0) if rng.random() < 0.9 else rng.randrange(10)
+            row.append(str(height))
+        grid.append(row)
+
+    yield from _grid_lines(grid)
+
+
+def day11(rng, scale):
+    yield " ".join(str(rng.randrange(10 ** rng.randint(1, 7))) for _ in range(8 * scale))
+
+
+def day12(rng, scale):
+    size = 140 * scale
+    grid = [[rng.choice(ascii_lowercase.upper())] * size for _ in range(size)]
+
+    # overlapping rectangles of plants make for regions with plenty of sides and holes
+    for _ in range(size * size // 30):
+        r, c = rng.randrange(size), rng.randrange(size)
+        plant = rng.choice(ascii_lowercase.upper())
+        for dr, dc in product(range(rng.randint(1, 10)), range(rng.randint(1, 10))):
+            if r + dr < size and c + dc < size:
+                grid[r + dr][c + dc] = plant
+
+    yield from _grid_lines(grid)
+
+
+def day13(rng, scale):
+    for idx in range(320 * scale):
+        while True:
+            ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+            if ax * by != ay * bx:
+                break
+
+        if rng.random() < 0.5:
+            a, b = rng.randint(0, 100), rng.randint(0, 100)
+            px, py = a * ax + b * bx, a * ay + b * by
+        else:
+            px, py = rng.randint(1000, 20000), rng.randint(1000, 20000)
+
+        if idx:
+            yield ""
+        yield f"Button A: X+{ax}, Y+{ay}"
+        yield f"Button B: X+{bx}, Y+{by}"
+        yield f"Prize: X={px}, Y={py}"
+
+
+def day14(rng, scale, width=101, height=103):
+    # arrange some of the robots into a picture of a tree at a random time
+    time = rng.randrange(width * height)
+    left, top = rng.randrange(width - 31), rng.randrange(height - 33)
+    tree = [(left + 15 + dx, top + y) for y in range(30) for dx in range(-(y // 2), y // 2 + 1)]
+    tree += [(left + 15 + dx, top + y) for y in range(30, 33) for dx in range(-1, 2)]
+
+    robots = list()
+    for x, y in tree:
+        vx, vy = rng.randint(-100, 100), rng.randint(-100, 100)
+        robots.append(((x - time * vx) % width, (y - time * vy) % height, vx, vy))
+
+    for _ in range(500 * scale - len(tree)):
+        robots.append(
+            (
+                rng.randrange(width),
+                rng.randrange(height),
+                rng.randint(-100, 100),
+                rng.randint(-100, 100),
+            )
+        )
+
+    rng.shuffle(robots)
+    for px, py, vx, vy in robots:
+        yield f"p={px},{py} v={vx},{vy}"
+
+
+def day15(rng, scale):
+    size = 50 * scale
+    grid = [["#"] * size] + [["#"] + ["."] * (size - 2) + ["#"] for _ in range(size - 2)]
+    grid.append(["#"] * size)
+
+    for r, c in product(range(1, size - 1), repeat=2):
+        x = rng.random()
+        grid[r][c] = "#" if x < 0.03 else "O" if x < 0.25 else "."
+
+    grid[rng.randrange(1, size - 1)][rng.randrange(1, size - 1)] = "@"
+
+    yield from _grid_lines(grid)
+    yield ""
+
+    for _ in range(20 * scale):
+        yield "".join(rng.choices("<>^v", k=1000))
+
+
+def day16(rng, scale):
+    size = 141 * scale
+    size += 1 - size % 2  # the maze needs an odd size
+    grid = _maze(rng, size)
+
+    # knock through some walls so that there are several paths, and several best paths
+    for r, c in product(range(1, size - 1), repeat=2):
+        if grid[r][c] == "#" and (r % 2) != (c % 2) and rng.random() < 0.1:
+            grid[r][c] = "."
+
+    grid[size - 2][1] = "S"
+    grid[1][size - 2] = "E"
+
+    yield from _grid_lines(grid)
+
+
+def day17(rng, scale):
+    # the second part's solution is specific to this program
+    bits = 48 * scale
+    yield f"Register A: {rng.getrandbits(bits) | 1 << (bits - 1)}"
+    yield "Register B: 0"
+    yield "Register C: 0"
+    yield ""
+    yield "Program: 2,4,1,2,7,5,1,3,4,3,5,5,0,3,3,0"
+
+
+def day18(rng, scale, size=71):
+    def blocked(walls):
+        walls = set(walls)
+        seen = {(0, 0)}
+        queue = deque([(0, 0)])
+        while queue:
+            r, c = queue.popleft()
+            if (r, c) == (size - 1, size - 1):
+                return False
+            for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                pos = r + dr, c + dc
+                in_bounds = 0 <= pos[0] < size and 0 <= pos[1] < size
+                if in_bounds and pos not in walls and pos not in seen:
+                    seen.add(pos)
+                    queue.append(pos)
+        return True
+
+    cells = [pos for pos in product(range(size), repeat=2) if pos not in ((0, 0), (size - 1,) * 2)]
+
+    # the first kilobyte must leave a path open
+    while True:
+        rng.shuffle(cells)
+        if not blocked(cells[:1024]):
+            break
+
+    n_bytes = min(3450 * scale, len(cells))
+    if not blocked(cells[:n_bytes]):
+        n_bytes = len(cells)
+
+    for x, y in cells[:n_bytes]:
+        yield f"{x},{y}"
+
+
+def day19(rng, scale):
+    towels = sorted({"".join(rng.choices("wubrg", k=rng.randint(1, 8))) for _ in range(450)})
+    yield ", ".join(towels)
+    yield ""
+
+    for _ in range(400 * scale):
+        length = rng.randint(20, 60)
+        if rng.random() < 0.7:
+            design = ""
+            while len(design) < length:
+                design += rng.choice(towels)
+        else:
+            design = "".join(rng.choices("wubrg", k=length))
+        yield design
+
+
+def day20(rng, scale):
+    size = 141 * scale
+    size += 1 - size % 2
+    maze = _maze(rng, size)
+    start, end = (size - 2, 1), (1, size - 2)
+
+    # the racetrack is the single path from start to end through the maze
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        r, c = queue.popleft()
+        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            pos = r + dr, c + dc
+            if maze[pos[0]][pos[1]] == "." and pos not in parents:
+                parents[pos] = r, c
+                queue.append(pos)
+
+    grid = [["#"] * size for _ in range(size)]
+    pos = end
+    while pos:
+        grid[pos[0]][pos[1]] = "."
+        pos = parents[pos]
+
+    grid[start[0]][start[1]] = "S"
+    grid[end[0]][end[1]] = "E"
+
+    yield from _grid_lines(grid)
+
+
+def day21(rng, scale):
+    for _ in range(5 * scale):
+        yield f"{rng.randrange(1000):03d}A"
+
+
+def day22(rng, scale):
+    for _ in range(2000 * scale):
+        yield str(rng.randrange(1, 16777216))
+
+
+def day23(rng, scale):
+    n_nodes = 520 * scale
+    name_length = 2 if n_nodes <= 26**2 else 3
+    names = rng.sample(list(product(ascii_lowercase, repeat=name_length)), n_nodes)
+    names = ["".join(name) for name in names]
+
+    edges = set()
+
+    # a single large clique for the second part to find, in a sparse random graph
+    clique = rng.sample(names, 13)
+    edges.update(frozenset(pair) for pair in product(clique, repeat=2) if pair[0] != pair[1])
+
+    while len(edges) < 13 * n_nodes // 2:
+        a, b = rng.sample(names, 2)
+        edges.add(frozenset((a, b)))
+
+    # sets are ordered by hash, which varies between processes, so put the edges in a canonical
+    # order before shuffling them (and the ends of each edge) with the seeded generator
+    edges = [rng.sample(edge, 2) for edge in sorted(sorted(edge) for edge in edges)]
+    rng.shuffle(edges)
+    for a, b in edges:
+        yield f"{a}-{b}"
+
+
+def day24(rng, scale):
+    # the solution expects two-digit wire numbers, so don't go past 99 bits
+    n_bits = min(45 * scale, 99)
+
+    wires = set()
+
+    def new_wire():
+        while True:
+            # not starting with x, y or z, which are the input and output wires
+            first = rng.choice("abcdefghijklmnopqrstuvw")
+            wire = first + "".join(rng.choices(ascii_lowercase, k=2))
+            if wire not in wires:
+                wires.add(wire)
+                return wire
+
+    def bit_wire(prefix, bit):
+        return f"{prefix}{bit:02d}"
+
+    # a ripple-carry adder: gates 1-5 of each full adder (see `day24.part2`) by name
+    adders = list()
+    carry = None
+    for bit in range(n_bits):
+        x, y, z = bit_wire("x", bit), bit_wire("y", bit), bit_wire("z", bit)
+        if not bit:
+            carry = new_wire()
+            adders.append({"z": [x, "XOR", y, z], "j": [x, "AND", y, carry]})
+            continue
+
+        i, j, k = new_wire(), new_wire(), new_wire()
+        carry_out = bit_wire("z", n_bits) if bit == n_bits - 1 else new_wire()
+        adders.append(
+            {
+                "i": [x, "XOR", y, i],
+                "z": [carry, "XOR", i, z],
+                "j": [x, "AND", y, j],
+                "k": [carry, "AND", i, k],
+                "C": [j, "OR", k, carry_out],
+            }
+        )
+        carry = carry_out
+
+    # swap a pair of outputs in four adders far enough apart that they don't interfere, and late
+    # enough that their input names have two digits (which the solution relies upon)
+    bits = list()
+    while len(bits) < 4:
+        bit = rng.randrange(11, n_bits - 1)
+        if all(abs(bit - other) > 2 for other in bits):
+            bits.append(bit)
+
+    for bit in bits:
+        a, b = rng.choice([("i", "j"), ("z", "k"), ("z", "C")])
+        gate_a, gate_b = adders[bit][a], adders[bit][b]
+        gate_a[3], gate_b[3] = gate_b[3], gate_a[3]
+
+    for prefix in ("x", "y"):
+        for bit in range(n_bits):
+            yield f"{bit_wire(prefix, bit)}: {rng.randint(0, 1)}"
+
+    yield ""
+
+    gates = [gate for adder in adders for gate in adder.values()]
+    rng.shuffle(gates)
+    for a, op, b, out in gates:
+        yield f"{a} {op} {b} -> {out}"
+
+
+def day25(rng, scale):
+    schematics = list()
+    for _ in range(500 * scale):
+        heights = [rng.randint(0, 5) for _ in range(5)]
+        rows = [["#" if row <= height else "." for height in heights] for row in range(7)]
+
+        # locks are filled from the top, keys from the bottom
+        if rng.random() < 0.5:
+            rows.reverse()
+        schematics.append(rows)
+
+    for idx, rows in enumerate(schematics):
+        if idx:
+            yield ""
+        yield from _grid_lines(rows)
@@ -0,0 +1,124 @@
+"""Lightweight instrumentation for the solutions.
+
+Day modules can record named counters, gauges and timers with `count`, `gauge` and `timer`. Nothing
+is recorded unless collection has been switched on with `collect`, in which case `run_part` records
+each part (and each shared parse) under a label such as `day16.part1`, along with its wall time and
+the peak RSS of the process once it has finished. Metrics recorded by parts' worker processes (see
+`map_chunks`) are merged into the part's record with `merge`. While collection is off, the recording
+functions return after a single check, but hot loops should still tally locally and record once at
+the end.
+"""
+
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import sys
+import time
+
+
+enabled = False
+
+# mapping of label to the record of a part, filled in while collecting
+results = dict()
+
+# records of the parts currently running; the innermost is last
+_stack = list()
+
+
+def peak_rss():
+    """Return the peak resident set size of the process so far in bytes, or `None` if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # reported in bytes on macOS but kilobytes elsewhere
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+@contextmanager
+def collect():
+    """Switch on collection for the duration of the block, yielding the dict of records."""
+    global enabled, results
+
+    previous = enabled, results
+    enabled, results = True, dict()
+    try:
+        yield results
+    finally:
+        enabled, results = previous
+
+
+@contextmanager
+def record(label):
+    """Record the counters, gauges and timers of a part, along with its wall time and peak RSS."""
+    entry = {"counters": Counter(), "gauges": dict(), "timers": defaultdict(float)}
+    _stack.append(entry)
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        entry["wall"] = time.perf_counter() - start
+        entry["peak_rss"] = peak_rss()
+        _stack.pop()
+        results[label] = entry
+
+
+def merge(entry):
+    """Add the counters and timers of a record made in a worker process to the current record,
+    keeping its gauges and the largest peak RSS of the workers as `worker_peak_rss`.
+    """
+    if not _stack:
+        return
+
+    current = _stack[-1]
+    current["counters"].update(entry["counters"])
+    current["gauges"].update(entry["gauges"])
+    for name, value in entry["timers"].items():
+        current["timers"][name] += value
+
+    if entry["peak_rss"] is not None:
+        current["worker_peak_rss"] = max(current.get("worker_peak_rss", 0), entry["peak_rss"])
+
+
+def count(name, n=1):
+    if _stack:
+        _stack[-1]["counters"][name] += n
+
+
+def gauge(name, value):
+    if _stack:
+        _stack[-1]["gauges"][name] = value
+
+
+class timer:
+    """Context manager which adds the time spent in its block to the timer `name`."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter() if _stack else None
+
+    def __exit__(self, *exc_info):
+        if self.start is not None and _stack:
+            _stack[-1]["timers"][self.name] += time.perf_counter() - self.start
+
+
+def summary_rows(records):
+    """Yield `(label, metric, value)` rows summarizing `records` for display."""
+    for label, entry in records.items():
+        yield label, "wall (s)", f"{entry['wall']:.3f}"
+        if entry["peak_rss"] is not None:
+            yield label, "peak RSS (MiB)", f"{entry['peak_rss'] / 2**20:.1f}"
+        if "worker_peak_rss" in entry:
+            yield label, "worker peak RSS (MiB)", f"{entry['worker_peak_rss'] / 2**20:.1f}"
+        for name, value in entry["timers"].items():
+            yield label, f"{name} (s)", f"{value:.3f}"
+        for name, value in entry["counters"].items():
+            yield label, name, value
+        for name, value in entry["gauges"].items():
+            yield label, name, value
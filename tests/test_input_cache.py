@@ -0,0 +1,93 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from threading import Thread
+
+import pytest
+
+from aoc import get_input
+
+
+INPUT = "1 2 3\n4 5 6\n"
+ETAG = '"v1"'
+
+
+class InputHandler(BaseHTTPRequestHandler):
+    """Serves `INPUT` for any day, answering a conditional request for the current ETag with 304."""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = INPUT.encode()
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    """Start a stand-in input server on an ephemeral port, with the input URL and cache directory
+    pointing at it and at a temporary directory.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), InputHandler)
+    server.requests = list()
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    host, port = server.server_address
+    monkeypatch.setenv("AOC_INPUT_URL", f"http://{host}:{port}/2024/day/{{day}}/input")
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("AOC_SESSION", "test-session")
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_fetch_fills_cache(server, tmp_path):
+    assert get_input(1) == INPUT
+
+    path, headers = server.requests[0]
+    assert path == "/2024/day/1/input"
+    assert "session=test-session" in headers["Cookie"]
+
+    cache_dir = tmp_path / "cache"
+    entry = json.loads((cache_dir / "index" / "day1.json").read_text())
+    assert entry["etag"] == ETAG
+    assert (cache_dir / "objects" / entry["sha256"]).read_text() == INPUT
+
+    # served from the cache from now on
+    assert get_input(1) == INPUT
+    assert len(server.requests) == 1
+
+
+def test_revalidate_not_modified(server, tmp_path):
+    get_input(1)
+
+    # a 304 keeps the cached copy, even if it's been changed on disk since
+    entry = json.loads((tmp_path / "cache" / "index" / "day1.json").read_text())
+    (tmp_path / "cache" / "objects" / entry["sha256"]).write_text("cached")
+
+    assert get_input(1, revalidate=True) == "cached"
+
+    assert len(server.requests) == 2
+    _, headers = server.requests[1]
+    assert headers["If-None-Match"] == ETAG
+
+
+def test_offline_miss(server):
+    with pytest.raises(FileNotFoundError):
+        get_input(1, offline=True)
+
+    assert not server.requests